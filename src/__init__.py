@@ -1,13 +1,23 @@
 # Paper Writer - 论文写作辅助系统
 
-from .config import Config, get_config
-from .analyzer.journal_style_analyzer import JournalStyleAnalyzer, analyze_journal_style
-from .literature.db_manager import LiteratureDatabaseManager, create_literature_database
+import importlib
+
 # from .coordinator.multi_agent_coordinator import MultiAgentCoordinator, run_coordinator  # 暂时注释掉
 # from .integrator.draft_integrator import DraftIntegrator, integrate_sections  # 暂时注释掉
 
 __version__ = "0.1.0"
 
+# 公开名称 -> 所在子模块；首次访问时才导入（分析器依赖spaCy，导入耗时较长），
+# 这样CLI子命令只加载自己用到的模块
+_LAZY_EXPORTS = {
+    "Config": ".config",
+    "get_config": ".config",
+    "JournalStyleAnalyzer": ".analyzer.journal_style_analyzer",
+    "analyze_journal_style": ".analyzer.journal_style_analyzer",
+    "LiteratureDatabaseManager": ".literature.db_manager",
+    "create_literature_database": ".literature.db_manager",
+}
+
 __all__ = [
     "Config",
     "get_config",
@@ -20,3 +30,17 @@ __all__ = [
     # "DraftIntegrator",  # 暂时注释掉
     # "integrate_sections",  # 暂时注释掉
 ]
+
+
+def __getattr__(name):
+    module_path = _LAZY_EXPORTS.get(name)
+    if module_path is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_path, __name__), name)
+    # 缓存到模块命名空间，之后的访问不再经过 __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
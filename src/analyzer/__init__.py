@@ -1,4 +1,25 @@
 # Analyzer package
-from .journal_style_analyzer import JournalStyleAnalyzer, analyze_journal_style
+import importlib
+
+# 公开名称 -> 所在子模块；首次访问时才导入，
+# 这样只用到 ai_deepseek_analyzer 的调用方（及测试收集）不会加载spaCy/NLTK
+_LAZY_EXPORTS = {
+    "JournalStyleAnalyzer": ".journal_style_analyzer",
+    "analyze_journal_style": ".journal_style_analyzer",
+}
 
 __all__ = ["JournalStyleAnalyzer", "analyze_journal_style"]
+
+
+def __getattr__(name):
+    module_path = _LAZY_EXPORTS.get(name)
+    if module_path is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_path, __name__), name)
+    # 缓存到模块命名空间，之后的访问不再经过 __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
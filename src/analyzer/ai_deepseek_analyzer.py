@@ -5,15 +5,78 @@ AI增强的期刊风格分析器
 严格按照journal_section_style_skill.md的标准化流程工作
 """
 
+import copy
+import hashlib
 import json
 import os
 import re
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 import requests
+from requests.adapters import HTTPAdapter
 from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import islice
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+# 参与风格分析的论文数量上限
+MAX_STYLE_PAPERS = 10
+
+# 各章节并发分析的最大请求数（DeepSeek的瓶颈在网络往返与服务端生成）
+BATCH_MAX_WORKERS = 6
+
+# 固定的system前缀：skill全文紧随其后，所有请求逐字节相同，
+# 以便DeepSeek的上下文硬盘缓存（前缀缓存）命中，免去重复预填充skill
+SKILL_SYSTEM_PREAMBLE = (
+    "You are an expert academic writing style analyst. "
+    "You must output valid JSON format only."
+)
+
+# 所有调用都要求JSON输出：启用JSON模式，服务端保证返回可解析的JSON对象，
+# 避免因代码块包裹或多余文字导致的解析失败与整轮重试（prompt中须含"JSON"字样）
+JSON_RESPONSE_FORMAT = {"type": "json_object"}
+
+# Section Style Card 的8个必需维度与词汇特征的4类词性
+SECTION_CARD_DIMENSIONS = (
+    "function",
+    "role_in_paper",
+    "information_structure",
+    "information_density",
+    "stance_hedging",
+    "sentence_pattern_functions",
+    "lexical_features_by_pos",
+    "constraints_and_avoidances",
+)
+SECTION_CARD_POS = ("nouns", "verbs", "adjectives", "adverbs")
+
+# 进程内Section Style Card缓存：(skill哈希, prompt哈希) -> 分析结果
+SECTION_CARD_CACHE_SIZE = 128
+_section_card_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+_section_card_cache_lock = threading.Lock()
+
+
+def _content_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+_HORIZONTAL_SPACE_RE = re.compile(r"[ \t\r\f\v]+")
+_BLANK_LINES_RE = re.compile(r"\n\s*\n\s*\n+")
+
+
+def _normalize_sample(text: str) -> str:
+    # 空格/制表符合并为一个空格，连续空行合并为一个空行，保留段落结构
+    text = _HORIZONTAL_SPACE_RE.sub(" ", text)
+    return _BLANK_LINES_RE.sub("\n\n", text).strip()
+
+
+@lru_cache(maxsize=8)
+def _read_skill_file(path: str, mtime_ns: int) -> str:
+    # 以修改时间为键的一部分：同一进程内各分析器实例共享一次读取，文件改动后自动重读
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
 
 @dataclass
 class StyleDimension:
@@ -47,20 +110,46 @@ class AIDeepSeekAnalyzer:
         self.api_key = api_key
         self.base_url = base_url.rstrip("/")
         self.model = "deepseek-chat"
+        # 复用连接：多次章节分析共用TCP/TLS会话，连接池容纳全部并发章节请求
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=BATCH_MAX_WORKERS)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         self.skill_file_path = (
             r"E:\AI_projects\学术写作\paper_writer\journal_section_style_skill.md"
         )
+        self._skill_content: Optional[str] = None
+        self._skill_system_message: Optional[Dict[str, str]] = None
+        self._skill_hash = ""
+        # 已预热前缀缓存的skill版本（内容哈希）
+        self._warmed_skill_hash: Optional[str] = None
 
     def load_skill_definition(self) -> str:
-        """加载skill定义文件"""
+        """加载skill定义文件（按修改时间缓存，进程内各实例共享；文件改动后重读）"""
         try:
-            with open(self.skill_file_path, "r", encoding="utf-8") as f:
-                return f.read()
+            return _read_skill_file(
+                self.skill_file_path, os.stat(self.skill_file_path).st_mtime_ns
+            )
         except FileNotFoundError:
             raise FileNotFoundError(f"Skill file not found: {self.skill_file_path}")
         except Exception as e:
             raise Exception(f"Failed to load skill file: {e}")
 
+    @property
+    def skill_system_message(self) -> Dict[str, str]:
+        """以skill为内容的system消息；skill文件未改动时原样复用"""
+        skill_content = self.load_skill_definition()
+        if skill_content != self._skill_content:
+            self._skill_hash = _content_hash(skill_content)
+            self._skill_system_message = {
+                "role": "system",
+                "content": f"{SKILL_SYSTEM_PREAMBLE}\n\n"
+                f"Skill definition:\n{skill_content}",
+            }
+            # 最后更新内容：并发读取时见到新内容即可见到对应的消息与哈希
+            self._skill_content = skill_content
+        return self._skill_system_message
+
     def extract_paper_sections(
         self, paper_text: str, journal_name: str
     ) -> Dict[str, str]:
@@ -74,13 +163,9 @@ class AIDeepSeekAnalyzer:
         Returns:
             Dict[str, str]: 章节名称到章节内容的映射
         """
-        skill_content = self.load_skill_definition()
-
-        prompt = f"""You are an expert academic paper analyst. First, carefully read and understand this skill definition:
+        system_message = self.skill_system_message
 
-{skill_content}
-
-Now, your task is to extract ALL identifiable sections from the provided academic paper. Follow these steps:
+        prompt = f"""You are an expert academic paper analyst. Using the skill definition given in the system message, your task is to extract ALL identifiable sections from the provided academic paper. Follow these steps:
 
 1. Read the entire paper carefully
 2. Identify all major sections (Abstract, Introduction, Methods, Results, Discussion, Conclusion, etc.)
@@ -103,7 +188,7 @@ Return ONLY a valid JSON object with this exact structure:
 
 If a section is not found, use an empty string for that section. Do not include any other text or explanations."""
 
-        response = self._call_deepseek_api(prompt)
+        response = self._call_deepseek_api(prompt, system_message)
 
         try:
             if isinstance(response, str):
@@ -130,7 +215,7 @@ If a section is not found, use an empty string for that section. Do not include
         Returns:
             Dict[str, Any]: 按照skill标准的Section Style Card格式分析结果
         """
-        skill_content = self.load_skill_definition()
+        system_message = self.skill_system_message
 
         # 检查样本数量
         if len(section_samples) < 5:
@@ -138,13 +223,12 @@ If a section is not found, use an empty string for that section. Do not include
                 f"Warning: Only {len(section_samples)} samples provided, skill requires ≥5 samples"
             )
 
-        # 合并所有样本文本
-        combined_samples = "\n\n--- SAMPLE SEPARATOR ---\n\n".join(section_samples)
-
-        prompt = f"""You are an expert academic writing style analyst. Your task is to create a Section Style Card following the skill definition EXACTLY.
+        # 合并所有样本文本（先压缩PDF提取带来的多余空白，同样的内容得到同样的prompt）
+        combined_samples = "\n\n--- SAMPLE SEPARATOR ---\n\n".join(
+            _normalize_sample(sample) for sample in section_samples
+        )
 
-First, carefully read and understand this skill definition:
-{skill_content}
+        prompt = f"""Your task is to create a Section Style Card for the journal "{journal_name}", following the skill definition given in the system message EXACTLY.
 
 CRITICAL REQUIREMENTS:
 1. You MUST produce a Section Style Card with ALL 8 dimensions
@@ -289,12 +373,21 @@ IMPORTANT: For "top_35" fields:
 
 Return ONLY the valid JSON object. No additional text or explanations."""
 
+        # 以实际发送的prompt为缓存键：超出截断长度的样本差异不影响结果，同样命中
+        cache_key = (self._skill_hash, _content_hash(prompt))
+        with _section_card_cache_lock:
+            cached = _section_card_cache.get(cache_key)
+            if cached is not None:
+                _section_card_cache.move_to_end(cache_key)
+                # 调用方可能就地修改结果，返回副本以免污染缓存
+                return copy.deepcopy(cached)
+
         # 调用API并验证结果
         max_retries = 3
         retry_count = 0
 
         while retry_count < max_retries:
-            response = self._call_deepseek_api(prompt)
+            response = self._call_deepseek_api(prompt, system_message)
 
             # 检查响应是否为空或无效
             if not response or response.strip() == "":
@@ -324,6 +417,10 @@ Return ONLY the valid JSON object. No additional text or explanations."""
 
                 # 验证结果格式
                 if self._validate_section_style_card(analysis_result):
+                    with _section_card_cache_lock:
+                        _section_card_cache[cache_key] = copy.deepcopy(analysis_result)
+                        if len(_section_card_cache) > SECTION_CARD_CACHE_SIZE:
+                            _section_card_cache.popitem(last=False)
                     return analysis_result
                 else:
                     print(f"Validation failed, retry {retry_count + 1}/{max_retries}")
@@ -339,31 +436,96 @@ Return ONLY the valid JSON object. No additional text or explanations."""
         print("Validation failed: Result doesn't match Section Style Card format")
         return {}
 
+    def analyze_sections_batch(
+        self,
+        samples_by_section: Dict[str, List[str]],
+        journal_name: str,
+        max_workers: int = BATCH_MAX_WORKERS,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        并发分析多个章节，返回 {章节名: Section Style Card}
+
+        每个章节仍是一次请求（样本合并进同一prompt），各章节的请求并发发出，
+        共用同一会话；分析失败的章节结果为空字典。
+        """
+        sections = {name: s for name, s in samples_by_section.items() if s}
+        if not sections:
+            return {}
+
+        # 并发请求同时到达时都还没有可复用的前缀缓存，先预热一次skill前缀
+        if len(sections) > 1:
+            self.warm_prefix_cache()
+
+        results = {}
+        workers = max(1, min(max_workers, len(sections)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(
+                    self.analyze_section_with_skill, samples, name, journal_name
+                ): name
+                for name, samples in sections.items()
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    print(f"Failed to analyze {name}: {e}")
+                    results[name] = {}
+
+        # 按输入顺序返回
+        return {name: results[name] for name in sections}
+
+    def warm_prefix_cache(self) -> None:
+        """
+        发送只含skill system消息、只生成1个token的请求，让服务端先缓存skill前缀
+
+        同一版本的skill只预热一次；预热失败不影响后续分析
+        """
+        system_message = self.skill_system_message
+        if self._warmed_skill_hash == self._skill_hash:
+            return
+        self._warmed_skill_hash = self._skill_hash
+
+        data = {
+            "model": self.model,
+            "messages": [
+                system_message,
+                {"role": "user", "content": "Reply with {}"},
+            ],
+            "max_tokens": 1,
+        }
+        try:
+            self.session.post(
+                f"{self.base_url}/chat/completions",
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                json=data,
+                timeout=60,
+            ).close()
+        except requests.exceptions.RequestException as e:
+            print(f"Prefix cache warm-up failed: {e}")
+
     def _validate_section_style_card(self, result: Dict[str, Any]) -> bool:
-        """验证Section Style Card格式是否符合skill要求"""
-        required_dimensions = [
-            "function",
-            "role_in_paper",
-            "information_structure",
-            "information_density",
-            "stance_hedging",
-            "sentence_pattern_functions",
-            "lexical_features_by_pos",
-            "constraints_and_avoidances",
-        ]
+        """验证Section Style Card格式是否符合skill要求
+
+        模型输出结构不可信：类型不符时判为不合格（触发重试），而不是抛出异常
+        """
+        if not isinstance(result, dict):
+            print("Section Style Card must be a JSON object")
+            return False
 
         # 检查所有必需维度
-        for dimension in required_dimensions:
+        for dimension in SECTION_CARD_DIMENSIONS:
             if dimension not in result:
                 print(f"Missing required dimension: {dimension}")
                 return False
 
         # 验证function格式
-        if (
-            not isinstance(result["function"].get("requirements"), list)
-            or len(result["function"]["requirements"]) < 3
-            or len(result["function"]["requirements"]) > 5
-        ):
+        function = result["function"]
+        requirements = (
+            function.get("requirements") if isinstance(function, dict) else None
+        )
+        if not isinstance(requirements, list) or not 3 <= len(requirements) <= 5:
             print("Function must have 3-5 requirements")
             return False
 
@@ -376,14 +538,17 @@ Return ONLY the valid JSON object. No additional text or explanations."""
             return False
 
         # 验证lexical features
-        required_pos = ["nouns", "verbs", "adjectives", "adverbs"]
-        for pos in required_pos:
-            if pos not in result["lexical_features_by_pos"]:
+        lexical_features = result["lexical_features_by_pos"]
+        if not isinstance(lexical_features, dict):
+            print("lexical_features_by_pos must be an object")
+            return False
+        for pos in SECTION_CARD_POS:
+            if pos not in lexical_features:
                 print(f"Missing lexical features for {pos}")
                 return False
             # 验证top_35字段
-            pos_features = result["lexical_features_by_pos"][pos]
-            if "top_35" not in pos_features:
+            pos_features = lexical_features[pos]
+            if not isinstance(pos_features, dict) or "top_35" not in pos_features:
                 print(f"Missing top_35 in {pos}")
                 return False
             if not isinstance(pos_features["top_35"], list):
@@ -391,9 +556,11 @@ Return ONLY the valid JSON object. No additional text or explanations."""
                 return False
 
         # 验证constraints格式
+        constraints = result["constraints_and_avoidances"]
         if (
-            "do" not in result["constraints_and_avoidances"]
-            or "dont" not in result["constraints_and_avoidances"]
+            not isinstance(constraints, dict)
+            or "do" not in constraints
+            or "dont" not in constraints
         ):
             print("Constraints must have 'do' and 'dont' lists")
             return False
@@ -451,8 +618,13 @@ Format your response as a structured JSON object."""
 
         return match.group(0) if match else skill_definition
 
-    def _call_deepseek_api(self, prompt: str) -> str:
-        """调用DeepSeek API - 返回原始响应字符串"""
+    def _call_deepseek_api(
+        self, prompt: str, system_message: Optional[Dict[str, str]] = None
+    ) -> str:
+        """调用DeepSeek API - 返回原始响应字符串
+
+        system_message 应放置不随请求变化的内容（如skill），保证前缀可被缓存
+        """
         url = f"{self.base_url}/chat/completions"
 
         headers = {
@@ -463,30 +635,31 @@ Format your response as a structured JSON object."""
         data = {
             "model": self.model,
             "messages": [
-                {
-                    "role": "system",
-                    "content": "You are an expert academic writing style analyst. You must output valid JSON format only.",
-                },
+                system_message or {"role": "system", "content": SKILL_SYSTEM_PREAMBLE},
                 {"role": "user", "content": prompt},
             ],
             "temperature": 0.3,
             "max_tokens": 4000,
+            "response_format": JSON_RESPONSE_FORMAT,
+            # 流式返回：超时按相邻数据块间隔计算，长篇生成不会因总时长超时而整轮重发
+            "stream": True,
         }
 
         try:
-            response = requests.post(url, headers=headers, json=data, timeout=120)
-            response.raise_for_status()
-            result = response.json()
-            return result["choices"][0]["message"]["content"]
-
-        except requests.exceptions.Timeout:
-            print("DeepSeek API timeout (120s), retrying...")
+            return self._post_streaming(url, headers, data, timeout=120)
+
+        # 流式读取中途超时会以 ConnectionError/ChunkedEncodingError 抛出，而非 Timeout
+        except (
+            requests.exceptions.Timeout,
+            requests.exceptions.ConnectionError,
+            requests.exceptions.ChunkedEncodingError,
+        ) as e:
+            print(
+                f"DeepSeek API timeout or connection dropped (120s): {e}, retrying..."
+            )
             # 重试一次
             try:
-                response = requests.post(url, headers=headers, json=data, timeout=180)
-                response.raise_for_status()
-                result = response.json()
-                return result["choices"][0]["message"]["content"]
+                return self._post_streaming(url, headers, data, timeout=180)
             except Exception as e2:
                 print(f"DeepSeek API retry failed: {e2}")
                 return ""
@@ -494,6 +667,37 @@ Format your response as a structured JSON object."""
             print(f"DeepSeek API call failed: {e}")
             return ""
 
+    def _post_streaming(
+        self, url: str, headers: Dict[str, str], data: Dict[str, Any], timeout: int
+    ) -> str:
+        """发送流式请求，读取SSE数据块并拼接为完整的回复文本
+
+        服务端或代理忽略 stream 参数、直接返回JSON时按普通响应解析；
+        事件流中没有任何数据事件时抛出 ValueError
+        """
+        pieces = []
+        received = False
+        with self.session.post(
+            url, headers=headers, json=data, timeout=timeout, stream=True
+        ) as response:
+            response.raise_for_status()
+            if "text/event-stream" not in response.headers.get("Content-Type", ""):
+                return response.json()["choices"][0]["message"]["content"]
+            for line in response.iter_lines(decode_unicode=True):
+                # 跳过空行与 ": keep-alive" 等注释行
+                if not line or not line.startswith("data: "):
+                    continue
+                payload = line[6:]
+                if payload == "[DONE]":
+                    break
+                received = True
+                chunk = json.loads(payload)
+                for choice in chunk.get("choices") or ():
+                    pieces.append((choice.get("delta") or {}).get("content") or "")
+        if not received:
+            raise ValueError("流式响应中没有数据事件")
+        return "".join(pieces)
+
     def _parse_ai_response(
         self, response: Dict[str, Any], section_name: str
     ) -> StyleDimension:
@@ -523,11 +727,24 @@ Format your response as a structured JSON object."""
         return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
 
+def get_deepseek_analyzer(
+    api_key: str, base_url: str = "https://api.deepseek.com/v1"
+) -> AIDeepSeekAnalyzer:
+    """按 (api_key, base_url) 返回进程内共享的分析器，复用其会话与已加载的skill"""
+    # 统一以位置参数调用，避免默认参数与显式传参被 lru_cache 视为不同的键
+    return _shared_deepseek_analyzer(api_key, base_url.rstrip("/"))
+
+
+@lru_cache(maxsize=4)
+def _shared_deepseek_analyzer(api_key: str, base_url: str) -> AIDeepSeekAnalyzer:
+    return AIDeepSeekAnalyzer(api_key, base_url)
+
+
 class R2RRAGEnhancer:
     """R2R RAG增强器 - 实现检索增强生成"""
 
     def __init__(self, api_key: str, base_url: str = "https://api.deepseek.com/v1"):
-        self.deepseek_analyzer = AIDeepSeekAnalyzer(api_key, base_url)
+        self.deepseek_analyzer = get_deepseek_analyzer(api_key, base_url)
         self.document_store = {}  # 简单的文档存储
 
     def enhance_with_rag(
@@ -681,23 +898,29 @@ def analyze_journal_style_with_ai(
     Returns:
         Dict[str, str]: 生成的文件路径字典
     """
-    from analyzer.journal_style_analyzer import JournalStyleAnalyzer
+    # 前置条件先行检查：缺少密钥时不必解析PDF再逐章节调用失败
+    if not deepseek_api_key:
+        raise ValueError("DeepSeek API key is required for AI style analysis")
+
+    from .journal_style_analyzer import JournalStyleAnalyzer
 
     # 初始化DeepSeek分析器
-    deepseek_analyzer = AIDeepSeekAnalyzer(deepseek_api_key)
+    deepseek_analyzer = get_deepseek_analyzer(deepseek_api_key)
 
     # 加载skill定义文件（将作为system prompt）
     skill_content = deepseek_analyzer.load_skill_definition()
 
     print(f"Loaded skill definition: {len(skill_content)} characters")
 
-    # 获取papers_dir中的所有文件
+    # 获取papers_dir中的文件：单次目录扫描，取够上限即停止
     if os.path.isdir(papers_dir):
-        paper_files = [
-            os.path.join(papers_dir, f)
-            for f in os.listdir(papers_dir)
-            if f.endswith((".pdf", ".md", ".txt"))
-        ]
+        with os.scandir(papers_dir) as entries:
+            candidates = (
+                entry.path
+                for entry in entries
+                if entry.name.endswith((".pdf", ".md", ".txt")) and entry.is_file()
+            )
+            paper_files = list(islice(candidates, MAX_STYLE_PAPERS))
     else:
         paper_files = [papers_dir]
 
@@ -712,7 +935,7 @@ def analyze_journal_style_with_ai(
     }
 
     # 处理每篇论文
-    for paper_file in paper_files[:10]:  # 限制处理前10个文件
+    for paper_file in paper_files:
         try:
             print(f"Processing: {paper_file}")
 
@@ -752,23 +975,25 @@ def analyze_journal_style_with_ai(
     section_guides = {}
 
     for section_name, samples in all_sections.items():
-        if not samples:
+        if samples:
+            print(f"Analyzing {section_name} section ({len(samples)} samples)")
+        else:
             print(f"Skipping {section_name}: no samples")
-            continue
+
+    # 调用DeepSeek进行8维度分析：各章节请求并发发出
+    # 传入：skill (system) + 论文文本 (user)
+    analysis_results = deepseek_analyzer.analyze_sections_batch(
+        all_sections, journal_name
+    )
+
+    for section_name, analysis_result in analysis_results.items():
+        samples = all_sections[section_name]
 
         print(f"\n{'=' * 60}")
-        print(f"Analyzing {section_name} section ({len(samples)} samples)")
+        print(f"{section_name} section ({len(samples)} samples)")
         print(f"{'=' * 60}")
 
         try:
-            # 调用DeepSeek进行8维度分析
-            # 传入：skill (system) + 论文文本 (user)
-            analysis_result = deepseek_analyzer.analyze_section_with_skill(
-                section_samples=samples,
-                section_name=section_name,
-                journal_name=journal_name,
-            )
-
             if not analysis_result:
                 print(f"  Failed to get analysis for {section_name}")
                 continue
@@ -791,18 +1016,7 @@ def analyze_journal_style_with_ai(
             print(f"  Generated: {guide_path}")
 
             # 验证结果包含8个维度
-            required_dimensions = [
-                "function",
-                "role_in_paper",
-                "information_structure",
-                "information_density",
-                "stance_hedging",
-                "sentence_pattern_functions",
-                "lexical_features_by_pos",
-                "constraints_and_avoidances",
-            ]
-
-            missing = [d for d in required_dimensions if d not in analysis_result]
+            missing = [d for d in SECTION_CARD_DIMENSIONS if d not in analysis_result]
             if missing:
                 print(f"  Warning: Missing dimensions: {missing}")
             else:
@@ -3,13 +3,18 @@
 支持参考文献格式提取和引用风格分析
 """
 
+import copy
+import hashlib
 import json
+import os
 import re
+import threading
 import requests
-from collections import Counter, defaultdict
+from collections import Counter, OrderedDict, defaultdict
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import nltk
 import pdfplumber
@@ -62,6 +67,31 @@ try:
 except LookupError:
     nltk.download("stopwords", quiet=True)
 
+# spaCy模型：风格分析只用到词性、依存句法与词元，加载时关闭NER
+SPACY_MODEL = "en_core_web_sm"
+SPACY_DISABLED_PIPES = ("ner",)
+
+
+@lru_cache(maxsize=4)
+def _get_nlp(model_name: str = SPACY_MODEL):
+    """按模型名缓存已加载的spaCy管道，各分析器实例共享同一个Language对象"""
+    return spacy.load(model_name, disable=list(SPACY_DISABLED_PIPES))
+
+
+@lru_cache(maxsize=4)
+def _get_stop_words(language: str = "english") -> frozenset:
+    return frozenset(stopwords.words(language))
+
+
+# nlp.pipe 每批处理的文本块数
+TEXT_PIPE_BATCH_SIZE = 8
+
+# analyze_text 结果缓存：进程内LRU，键为 (文本sha256, 章节)
+ANALYZE_TEXT_CACHE_SIZE = 1024
+
+_analyze_text_cache: "OrderedDict[Tuple[str, str], Dict]" = OrderedDict()
+_analyze_text_cache_lock = threading.Lock()
+
 
 @dataclass
 class JournalStyleReport:
@@ -153,8 +183,18 @@ class JournalStyleReport:
 
     def save(self, path: str) -> None:
         """保存报告"""
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        try:
+            import orjson
+        except ImportError:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        else:
+            # orjson 在C层完成编码，输出同样为UTF-8、缩进2格
+            Path(path).write_bytes(
+                orjson.dumps(
+                    self.to_dict(), option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+                )
+            )
 
 
 class JournalStyleAnalyzer:
@@ -356,8 +396,8 @@ class JournalStyleAnalyzer:
         """
         self.language = language
         self.deepseek_api_key = deepseek_api_key
-        self.nlp = spacy.load("en_core_web_sm")
-        self.stop_words = set(stopwords.words("english"))
+        self.nlp = _get_nlp()
+        self.stop_words = _get_stop_words("english")
 
         # 章节定义：标准学术论文的所有可能章节
         self.SECTION_DEFINITIONS = {
@@ -1552,6 +1592,36 @@ class JournalStyleAnalyzer:
         return sections
 
     def analyze_text(self, text: str, section: str = "general") -> Dict:
+        """
+        分析单段文本的风格特征（按文本内容哈希 + 章节缓存结果）
+
+        Args:
+            text: 文本
+            section: 文本所属章节
+
+        Returns:
+            风格分析结果
+        """
+        if not text.strip():
+            return {}
+
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        key = (text_hash, section)
+        with _analyze_text_cache_lock:
+            cached = _analyze_text_cache.get(key)
+            if cached is not None:
+                _analyze_text_cache.move_to_end(key)
+        if cached is None:
+            cached = self._analyze_text_uncached(text, section)
+            with _analyze_text_cache_lock:
+                _analyze_text_cache[key] = cached
+                if len(_analyze_text_cache) > ANALYZE_TEXT_CACHE_SIZE:
+                    _analyze_text_cache.popitem(last=False)
+
+        # 调用方会就地合并结果，返回副本以免污染缓存
+        return copy.deepcopy(cached)
+
+    def _analyze_text_uncached(self, text: str, section: str = "general") -> Dict:
         """
         分析单段文本的风格特征 - 添加内存管理和文本分块处理
 
@@ -1589,6 +1659,12 @@ class JournalStyleAnalyzer:
 
         print(f"文本分块: {len(chunks)} 个chunks, 总长度: {len(text)} 字符")
 
+        # 优先用 nlp.pipe 批量处理全部chunk；出错时退回下方的逐块处理（含更小分块重试）
+        try:
+            return self.analyze_text_chunks(chunks, section)
+        except Exception as e:
+            print(f"批量处理chunks失败，改为逐块处理: {e}")
+
         # 合并所有chunk的分析结果
         merged_result = {
             "vocabulary": {},
@@ -1791,58 +1867,70 @@ class JournalStyleAnalyzer:
             "sentence_types": sentence_types,
         }
 
-    def _analyze_chunk(self, doc, section: str) -> Dict:
-        """分析单个文档chunk"""
-        try:
-            # 词频统计
-            nouns = [
-                token.text.lower()
-                for token in doc
-                if token.pos_ == "NOUN"
-                and token.text.lower() not in self.stop_words
-                and len(token.text) > 2
-            ]
-            verbs = [
-                token.lemma_.lower()
-                for token in doc
-                if token.pos_ == "VERB"
-                and token.text.lower() not in self.stop_words
-                and len(token.text) > 2
-            ]
-            adjectives = [
-                token.text.lower()
-                for token in doc
-                if token.pos_ == "ADJ"
-                and token.text.lower() not in self.stop_words
-                and len(token.text) > 2
-            ]
-            adverbs = [
-                token.text.lower()
-                for token in doc
-                if token.pos_ == "ADV"
-                and token.text.lower() not in self.stop_words
-                and len(token.text) > 2
-            ]
+    def analyze_text_chunks(
+        self,
+        chunks: Iterable[str],
+        section: str = "general",
+        batch_size: int = TEXT_PIPE_BATCH_SIZE,
+    ) -> Dict:
+        """
+        流式分析一组文本块，逐块合并结果（不必先拼接成完整长文本）
+
+        Args:
+            chunks: 文本块的可迭代对象（可以是生成器）
+            section: 文本所属章节
+            batch_size: nlp.pipe 每批处理的文本块数
+
+        Returns:
+            与 analyze_text 相同结构的风格分析结果
+        """
+        merged_result = {
+            "vocabulary": {},
+            "sentence_structure": {},
+            "stylistic_features": {},
+        }
 
-            # 计算词频
-            from collections import Counter
+        texts = (chunk for chunk in chunks if chunk.strip())
+        for doc in self.nlp.pipe(texts, batch_size=batch_size):
+            self._merge_chunk_results(merged_result, self._analyze_chunk(doc, section))
 
-            noun_freq = Counter(nouns)
-            verb_freq = Counter(verbs)
-            adj_freq = Counter(adjectives)
-            adv_freq = Counter(adverbs)
+        return merged_result
 
-            # 句子长度统计
-            sentence_lengths = [len(sent.text.split()) for sent in doc.sents]
+    def _analyze_chunk(self, doc, section: str) -> Dict:
+        """分析单个文档chunk"""
+        try:
+            # 词频统计与被动语态检测：一次遍历token，按词性分桶
+            noun_freq = Counter()
+            verb_freq = Counter()
+            adj_freq = Counter()
+            adv_freq = Counter()
+            pos_buckets = {
+                "NOUN": noun_freq,
+                "VERB": verb_freq,
+                "ADJ": adj_freq,
+                "ADV": adv_freq,
+            }
+            stop_words = self.stop_words
+            passive_count = 0
+            for token in doc:
+                if token.dep_ == "nsubjpass":
+                    passive_count += 1
+                bucket = pos_buckets.get(token.pos_)
+                if bucket is None:
+                    continue
+                text = token.text
+                lower = text.lower()
+                if len(text) > 2 and lower not in stop_words:
+                    # 动词按词元计数，其余按小写原词
+                    bucket[token.lemma_.lower() if bucket is verb_freq else lower] += 1
+
+            # 句子长度统计（doc.sents 每次迭代都会重新切分，只取一次）
+            sentences = list(doc.sents)
+            sentence_lengths = [len(sent.text.split()) for sent in sentences]
             avg_sentence_length = (
                 sum(sentence_lengths) / len(sentence_lengths) if sentence_lengths else 0
             )
-
-            # 被动语态检测
-            passive_count = sum(1 for token in doc if token.dep_ == "nsubjpass")
-            passive_ratio = (
-                passive_count / len(list(doc.sents)) if list(doc.sents) else 0
-            )
+            passive_ratio = passive_count / len(sentences) if sentences else 0
 
             return {
                 "vocabulary": {
@@ -1853,7 +1941,7 @@ class JournalStyleAnalyzer:
                 },
                 "sentence_structure": {
                     "avg_sentence_length": avg_sentence_length,
-                    "sentence_count": len(list(doc.sents)),
+                    "sentence_count": len(sentences),
                     "total_tokens": len(doc),
                 },
                 "stylistic_features": {
@@ -1884,12 +1972,9 @@ class JournalStyleAnalyzer:
             # 合并词汇频率
             for category in ["nouns", "verbs", "adjectives", "adverbs"]:
                 if category in chunk_result.get("vocabulary", {}):
-                    for word, freq in chunk_result["vocabulary"][category].items():
-                        if category not in merged["vocabulary"]:
-                            merged["vocabulary"][category] = {}
-                        merged["vocabulary"][category][word] = (
-                            merged["vocabulary"][category].get(word, 0) + freq
-                        )
+                    merged["vocabulary"].setdefault(category, Counter()).update(
+                        chunk_result["vocabulary"][category]
+                    )
 
             # 合并句子结构（取平均值）
             if "sentence_structure" in chunk_result:
@@ -2425,6 +2510,23 @@ Subordinating: if, when, although (conditional procedures)
         }
 
 
+def _list_paper_files(paper_dir: Path) -> List[Path]:
+    """一次扫描目录，按 PDF、TXT、MD 的顺序返回论文文件（后缀不区分大小写）"""
+    if not paper_dir.is_dir():
+        return []
+    suffix_order = {".pdf": 0, ".txt": 1, ".md": 2}
+    found = []
+    with os.scandir(paper_dir) as entries:
+        for entry in entries:
+            # 与Windows下glob一致，Paper.PDF 同样计入
+            order = suffix_order.get(os.path.splitext(entry.name)[1].lower())
+            if order is not None and entry.is_file():
+                found.append((order, Path(entry.path)))
+    # 按后缀分组，组内保持目录顺序
+    found.sort(key=lambda item: item[0])
+    return [path for _, path in found]
+
+
 def analyze_journal_style(
     papers_dir: str,
     output_dir: str,
@@ -2443,12 +2545,7 @@ def analyze_journal_style(
     Returns:
         输出文件路径字典
     """
-    paper_dir = Path(papers_dir)
-    paper_paths = (
-        list(paper_dir.glob("*.pdf"))
-        + list(paper_dir.glob("*.txt"))
-        + list(paper_dir.glob("*.md"))
-    )
+    paper_paths = _list_paper_files(Path(papers_dir))
 
     if not paper_paths:
         raise ValueError(f"在 {papers_dir} 中未找到PDF/TXT/MD文件")
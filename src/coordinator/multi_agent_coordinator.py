@@ -11,6 +11,7 @@ import re
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union
 import requests
@@ -54,6 +55,26 @@ SECTION_MODEL_CONFIG = {
 # Default global model fallback
 DEFAULT_MODEL = "gpt-4o"
 
+# Chapter blocks in the combined style guide; one scan finds every chapter
+CHAPTER_STYLE_SECTION_RE = re.compile(
+    r"## (introduction|methods|results|discussion|conclusion|abstract)"
+    r".*?(?=\n##|\Z)",
+    re.DOTALL | re.IGNORECASE,
+)
+DEFAULT_CHAPTER_STYLE_GUIDE = (
+    "Follow standard academic writing conventions for this section."
+)
+
+
+@lru_cache(maxsize=32)
+def _parse_guide_sections(full_style_guide: str) -> Dict[str, str]:
+    """Split the style guide into {chapter: block} in a single pass"""
+    sections: Dict[str, str] = {}
+    for match in CHAPTER_STYLE_SECTION_RE.finditer(full_style_guide):
+        # Keep the first block per chapter, as a per-chapter search would
+        sections.setdefault(match.group(1).lower(), match.group(0).strip())
+    return sections
+
 
 class AgentStatus(Enum):
     """Agent status"""
@@ -1103,22 +1124,9 @@ class MultiAgentCoordinator:
 
     def extract_chapter_style_guide(self, full_style_guide: str, chapter: str) -> str:
         """Extract chapter-specific style guide"""
-        chapter_patterns = {
-            "introduction": r"## Introduction.*?(?=\n##|\Z)",
-            "methods": r"## Methods.*?(?=\n##|\Z)",
-            "results": r"## Results.*?(?=\n##|\Z)",
-            "discussion": r"## Discussion.*?(?=\n##|\Z)",
-            "conclusion": r"## Conclusion.*?(?=\n##|\Z)",
-            "abstract": r"## Abstract.*?(?=\n##|\Z)",
-        }
-
-        pattern = chapter_patterns.get(chapter.lower())
-        if pattern:
-            match = re.search(pattern, full_style_guide, re.DOTALL | re.IGNORECASE)
-            if match:
-                return match.group(0).strip()
-
-        return "Follow standard academic writing conventions for this section."
+        return _parse_guide_sections(full_style_guide).get(
+            chapter.lower(), DEFAULT_CHAPTER_STYLE_GUIDE
+        )
 
     def run_two_level_workflow(
         self,
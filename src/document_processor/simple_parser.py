@@ -5,11 +5,12 @@ Simple Document Parser - Support PDF/Word/Excel/Markdown
 
 import re
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 
-@dataclass
+@dataclass(slots=True)
 class DocumentElement:
     """文档元素类"""
 
@@ -19,7 +20,7 @@ class DocumentElement:
     page_number: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ParsedSection:
     """解析的章节"""
 
@@ -29,6 +30,38 @@ class ParsedSection:
     page_range: Tuple[int, int] = (0, 0)
 
 
+# 支持表格数据提取的文件后缀
+TABULAR_SUFFIXES = frozenset({".xlsx", ".xls", ".csv"})
+
+# 形如 "2. Materials And Methods" 的单行标题
+TITLE_LINE_RE = re.compile(r"^(?:\d+\.?\s*)?[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*$")
+
+# Markdown/纯文本段落标题前缀
+PARAGRAPH_TITLE_RE = re.compile(r"(#+|[0-9]+\.|[A-Z][a-z]+:)")
+
+# 去除首尾空白后的非空行（等价于 line.strip() 后过滤空行）
+NONBLANK_LINE_RE = re.compile(r"\S(?:.*\S)?")
+
+# 以空行分隔、去除首尾空白后的非空段落（等价于 split("\n\n") + strip() 后过滤空段落）
+PARAGRAPH_RE = re.compile(r"\S(?:[^\n]|\n(?!\n))*(?<=\S)")
+
+
+def _read_table(path: Path):
+    """读取CSV/Excel为DataFrame，优先使用更快的解析引擎（pyarrow/calamine），不可用时回退到默认引擎"""
+    import pandas as pd
+
+    if path.suffix.lower() == ".csv":
+        try:
+            return pd.read_csv(str(path), engine="pyarrow")
+        except (ImportError, ValueError):
+            return pd.read_csv(str(path))
+
+    try:
+        return pd.read_excel(str(path), engine="calamine")
+    except (ImportError, ValueError):
+        return pd.read_excel(str(path))
+
+
 class SimpleDocumentParser:
     """
     简单文档解析器
@@ -46,7 +79,19 @@ class SimpleDocumentParser:
     }
 
     def __init__(self):
-        pass
+        # 后缀 -> 解析方法
+        self._dispatch = {
+            ".txt": self._parse_text,
+            ".md": self._parse_text,
+            ".pdf": self._parse_pdf,
+            ".docx": self._parse_word,
+            ".doc": self._parse_word,
+            ".xlsx": self._parse_excel,
+            ".xls": self._parse_excel,
+            ".csv": self._parse_excel,
+        }
+        # 解析结果缓存：键为 (绝对路径, mtime, 文件大小)，文件变化后自动失效
+        self._parse_cached = lru_cache(maxsize=32)(self._parse_file)
 
     def parse(self, file_path: str) -> List[DocumentElement]:
         """
@@ -64,30 +109,32 @@ class SimpleDocumentParser:
             raise FileNotFoundError(f"文件不存在: {file_path}")
 
         suffix = path.suffix.lower()
-
-        if suffix in [".txt", ".md"]:
-            return self._parse_text(path)
-        elif suffix == ".pdf":
-            return self._parse_pdf(path)
-        elif suffix in [".docx", ".doc"]:
-            return self._parse_word(path)
-        elif suffix in [".xlsx", ".xls", ".csv"]:
-            return self._parse_excel(path)
-        else:
+        if suffix not in self._dispatch:
             raise ValueError(f"不支持的格式: {suffix}")
 
+        stat = path.stat()
+        elements = self._parse_cached(
+            str(path.resolve()), stat.st_mtime_ns, stat.st_size
+        )
+        # 返回副本，避免调用方修改列表影响缓存
+        return list(elements)
+
+    def _parse_file(
+        self, path_str: str, mtime_ns: int, size: int
+    ) -> List[DocumentElement]:
+        """实际解析文件（mtime_ns和size仅作为缓存键）"""
+        path = Path(path_str)
+        return self._dispatch[path.suffix.lower()](path)
+
     def _parse_text(self, path: Path) -> List[DocumentElement]:
         """解析文本/Markdown文件"""
         text = path.read_text(encoding="utf-8")
 
-        # 按段落分割
-        paragraphs = [p.strip() for p in text.split("\n\n") if p.strip()]
-
         elements = []
-        for i, para in enumerate(paragraphs):
-            if re.match(r"^(#+|[0-9]+\.|[A-Z][a-z]+:)", para.strip()):
-                elem_type = "Title"
-            elif para.startswith("#"):
+        # 按段落分割
+        for i, match in enumerate(PARAGRAPH_RE.finditer(text)):
+            para = match.group()
+            if PARAGRAPH_TITLE_RE.match(para):
                 elem_type = "Title"
             else:
                 elem_type = "Paragraph"
@@ -113,30 +160,7 @@ class SimpleDocumentParser:
                 markdown_text = result.document.export_to_markdown()
 
                 if markdown_text:
-                    elements = []
-
-                    # 按行处理Markdown文本
-                    lines = markdown_text.split("\n")
-                    for line in lines:
-                        line = line.strip()
-                        if line:
-                            # 判断是否为标题（Markdown格式）
-                            if line.startswith("#"):
-                                elem_type = "Title"
-                            elif re.match(
-                                r"^(?:\d+\.?\s*)?[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*$", line
-                            ):
-                                elem_type = "Title"
-                            else:
-                                elem_type = "Paragraph"
-
-                            elements.append(
-                                DocumentElement(
-                                    element_type=elem_type,
-                                    text=line[:5000] if len(line) > 5000 else line,
-                                    metadata={"page": 0},
-                                )
-                            )
+                    elements = list(self._iter_markdown_elements(markdown_text))
 
                     if elements:
                         return elements
@@ -150,6 +174,23 @@ class SimpleDocumentParser:
             print(f"Docling解析失败，回退到原始方法: {e}")
             return self._parse_pdf_fallback(path)
 
+    def _iter_markdown_elements(self, markdown_text: str) -> Iterator[DocumentElement]:
+        """逐行遍历Docling导出的Markdown文本，依次生成文档元素"""
+        for match in NONBLANK_LINE_RE.finditer(markdown_text):
+            line = match.group()
+
+            # 判断是否为标题（Markdown格式）
+            if line.startswith("#") or TITLE_LINE_RE.match(line):
+                elem_type = "Title"
+            else:
+                elem_type = "Paragraph"
+
+            yield DocumentElement(
+                element_type=elem_type,
+                text=line[:5000],
+                metadata={"page": 0},
+            )
+
     def _parse_pdf_fallback(self, path: Path) -> List[DocumentElement]:
         """回退的PDF解析方法 - 使用pdfplumber"""
         try:
@@ -163,27 +204,20 @@ class SimpleDocumentParser:
                     page_num += 1
                     text = page.extract_text() or ""
 
-                    if not text.strip():
-                        continue
-
-                    lines = text.split("\n")
-                    for line in lines:
-                        line = line.strip()
-                        if line:
-                            if re.match(
-                                r"^(?:\d+\.?\s*)?[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*$", line
-                            ):
-                                elem_type = "Title"
-                            else:
-                                elem_type = "Paragraph"
-
-                            elements.append(
-                                DocumentElement(
-                                    element_type=elem_type,
-                                    text=line,
-                                    metadata={"page": page_num},
-                                )
+                    for match in NONBLANK_LINE_RE.finditer(text):
+                        line = match.group()
+                        if TITLE_LINE_RE.match(line):
+                            elem_type = "Title"
+                        else:
+                            elem_type = "Paragraph"
+
+                        elements.append(
+                            DocumentElement(
+                                element_type=elem_type,
+                                text=line,
+                                metadata={"page": page_num},
                             )
+                        )
 
                 return elements
 
@@ -207,9 +241,7 @@ class SimpleDocumentParser:
                     # 检测标题
                     if para.style.name.startswith("Heading"):
                         elem_type = "Title"
-                    elif re.match(
-                        r"^(?:\d+\.?\s*)?[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*$", text
-                    ):
+                    elif TITLE_LINE_RE.match(text):
                         elem_type = "Title"
                     else:
                         elem_type = "Paragraph"
@@ -233,10 +265,7 @@ class SimpleDocumentParser:
             import pandas as pd
 
             # 读取所有sheet
-            if path.suffix == ".csv":
-                df = pd.read_csv(str(path))
-            else:
-                df = pd.read_excel(str(path))
+            df = _read_table(path)
 
             elements = []
             element_id = 0
@@ -263,13 +292,14 @@ class SimpleDocumentParser:
             element_id += 1
 
             # 3. 逐行解析每一行数据（精准到每个单元格）
-            for row_idx, row in df.iterrows():
-                row_data = []
-                for col_idx, (col_name, value) in enumerate(row.items()):
-                    # 格式化每个单元格的值
-                    cell_value = str(value) if pd.notna(value) else ""
-                    if cell_value and cell_value != "nan":
-                        row_data.append(f"{col_name}: {cell_value}")
+            # 空值处理和字符串转换一次性在pandas中完成，逐行只遍历普通字典
+            records = df.where(df.notna(), "").astype(str).to_dict(orient="records")
+            for row_idx, record in zip(df.index, records):
+                row_data = [
+                    f"{col_name}: {cell_value}"
+                    for col_name, cell_value in record.items()
+                    if cell_value and cell_value != "nan"
+                ]
 
                 if row_data:
                     elements.append(
@@ -341,15 +371,10 @@ class SimpleDocumentParser:
 
     def extract_table_data(self, file_path: str) -> Dict[str, Any]:
         """专门用于提取表格数据，返回结构化格式"""
-        if not Path(file_path).suffix.lower() in [".xlsx", ".xls", ".csv"]:
+        if Path(file_path).suffix.lower() not in TABULAR_SUFFIXES:
             raise ValueError("只有Excel/CSV文件支持表格数据提取")
 
-        import pandas as pd
-
-        if file_path.endswith(".csv"):
-            df = pd.read_csv(file_path)
-        else:
-            df = pd.read_excel(file_path)
+        df = _read_table(Path(file_path))
 
         return {
             "columns": df.columns.tolist(),
@@ -10,7 +10,7 @@ from typing import Any, Dict, List, Optional, Tuple
 import base64
 
 
-@dataclass
+@dataclass(slots=True)
 class ImageElement:
     """Image element extracted from document"""
 
@@ -22,7 +22,7 @@ class ImageElement:
     inline_position: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class TableElement:
     """Table element extracted from document"""
 
@@ -35,7 +35,7 @@ class TableElement:
     page_number: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class TextElement:
     """Text element from document"""
 
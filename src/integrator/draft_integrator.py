@@ -3,7 +3,11 @@
 """
 
 import json
+import mmap
+import os
 import re
+from bisect import bisect_right
+from collections import Counter, OrderedDict
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
@@ -11,6 +15,143 @@ from typing import Any, Dict, List, Optional, Tuple
 
 import yaml
 
+try:
+    # libyaml 提供的 C 加速解析器
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# 数据一致性检查的组合模式，一次扫描同时提取：
+#   sample  - 样本量，如 "n = 100"
+#   p_value - 统计显著性，如 "p < 0.05"
+#   Table / Figure - 图表引用，如 "Table 1"、"Figure 2"
+# 各分支的匹配内容互不重叠，因此结果与分别扫描相同
+CONSISTENCY_SCAN_RE = re.compile(
+    r"(?P<sample>n\s*[=:]\s*(?P<sample_value>\d+))"
+    r"|(?P<p_value>p\s*[<>=]\s*[\d.]+)"
+    r"|(?P<Table>Table\s*\d+)"
+    r"|(?P<Figure>Figure\s*\d+)"
+)
+
+# 图表引用术语
+REFERENCE_TERMS = ("Table", "Figure")
+
+# 章节末段中承上启下的过渡短语（子串匹配，忽略大小写）
+CLOSING_TRANSITION_RE = re.compile(
+    "subsequently|therefore|these results|to examine|we then", re.IGNORECASE
+)
+
+# 章节首段已有的过渡词；存在时不再额外添加过渡句
+OPENING_TRANSITION_RE = re.compile("however|therefore|furthermore", re.IGNORECASE)
+
+# 拼接章节时使用的分隔符；不属于空白字符，任何扫描模式都不会跨章节匹配
+SECTION_SEPARATOR = "\x00"
+
+# 章节文本达到该长度时，过渡词扫描改用 Hyperscan（若已安装）
+HYPERSCAN_MIN_CHARS = 100_000
+
+# 已解析配置的缓存：(绝对路径, mtime, 文件大小) -> 配置字典
+_CONFIG_CACHE: "OrderedDict[Tuple[str, int, int], Dict[str, Any]]" = OrderedDict()
+_CONFIG_CACHE_SIZE = 32
+
+
+def _load_config(config_path: str) -> Dict[str, Any]:
+    """
+    加载YAML配置，文件未变化时直接复用已解析的结果
+
+    Args:
+        config_path: 配置文件路径
+
+    Returns:
+        配置字典（多个实例共享，只读使用）
+    """
+    path = Path(config_path).resolve()
+    stat = path.stat()
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+
+    config = _CONFIG_CACHE.get(key)
+    if config is not None:
+        _CONFIG_CACHE.move_to_end(key)
+        return config
+
+    with open(path, "r") as f:
+        config = yaml.load(f, Loader=_YamlLoader)
+
+    _CONFIG_CACHE[key] = config
+    if len(_CONFIG_CACHE) > _CONFIG_CACHE_SIZE:
+        _CONFIG_CACHE.popitem(last=False)
+    return config
+
+
+def _read_section_file(file_path: str) -> str:
+    """
+    通过内存映射读取章节文件，由操作系统按需换页
+
+    Args:
+        file_path: 章节文件路径
+
+    Returns:
+        文件内容（换行符统一为 "\\n"，与文本模式读取一致）
+    """
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # 直接从映射缓冲区解码，省去中间 bytes 副本
+            text = str(mm, "utf-8")
+
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def _count_section_words(sections: Dict[str, str]) -> Dict[str, int]:
+    """统计各章节字数（str.split 在C层完成分词，比逐个正则匹配计数更快）"""
+    return {section: len(content.split()) for section, content in sections.items()}
+
+
+def _compile_transition_scanner(
+    transition_words: Dict[str, List[str]],
+) -> Tuple["re.Pattern[str]", Dict[str, Tuple[str, ...]]]:
+    """
+    将所有类别的过渡词编译为单个交替模式，一次扫描即可统计全部类别
+
+    Returns:
+        (匹配任意过渡词的模式, 小写过渡词 -> 所属类别)
+    """
+    word_categories: Dict[str, Tuple[str, ...]] = {}
+    for category, words in transition_words.items():
+        for word in words:
+            word_categories[word] = word_categories.get(word, ()) + (category,)
+
+    alternation = "|".join(
+        re.escape(word) for word in sorted(word_categories, key=len, reverse=True)
+    )
+    return re.compile(rf"\b(?:{alternation})\b", re.IGNORECASE), word_categories
+
+
+@dataclass
+class _SectionBuffer:
+    """所有章节拼接而成的共享文本，供多项分析共用一次扫描"""
+
+    text: str
+    names: List[str]
+    starts: List[int]
+
+    @classmethod
+    def from_sections(cls, sections: Dict[str, str]) -> "_SectionBuffer":
+        names = list(sections)
+        starts = []
+        pos = 0
+        for content in sections.values():
+            starts.append(pos)
+            pos += len(content) + len(SECTION_SEPARATOR)
+        return cls(SECTION_SEPARATOR.join(sections.values()), names, starts)
+
+    def section_at(self, pos: int) -> str:
+        """返回文本位置所在的章节名"""
+        return self.names[bisect_right(self.starts, pos) - 1]
+
 
 @dataclass
 class ConsistencyIssue:
@@ -114,6 +255,50 @@ class DraftIntegrator:
         ],
     }
 
+    # 覆盖全部类别的过渡词模式；同一个词可能属于多个类别（如 furthermore）
+    _TRANSITION_RE, _TRANSITION_WORD_CATEGORIES = _compile_transition_scanner(
+        TRANSITION_WORDS
+    )
+    _TRANSITION_CATEGORIES = tuple(TRANSITION_WORDS)
+
+    # 常见的术语变体（标准术语 -> 变体列表）
+    TERM_VARIANTS = {
+        "crop yield": [
+            "crop yield",
+            "Crop yield",
+            "crop yields",
+            "Crop yields",
+            "yields",
+        ],
+        "significant": [
+            "significant",
+            "Significant",
+            "significantly",
+            "Significantly",
+        ],
+        "control group": ["control group", "Control group", "control", "Control"],
+        "treatment group": [
+            "treatment group",
+            "Treatment group",
+            "treatment",
+            "Treatment",
+        ],
+    }
+
+    # 去重后的小写变体集合（大小写不同的变体只需查找一次）
+    _TERM_VARIANT_KEYS = frozenset(
+        variant.lower() for variants in TERM_VARIANTS.values() for variant in variants
+    )
+
+    # 术语变体的 Aho-Corasick 自动机，首次使用时构建（False 表示未安装 pyahocorasick）
+    _term_automaton = None
+
+    # 过渡词的 Hyperscan 数据库及其模式ID对应的词，首次使用时构建（False 表示未安装 hyperscan）
+    _transition_hs_db = None
+
+    # 过渡词模式的 RE2 版本，首次使用时编译（False 表示未安装 google-re2）
+    _transition_re2 = None
+
     def __init__(self, config_path: str = "config/config.yaml"):
         """
         初始化整合器
@@ -121,8 +306,7 @@ class DraftIntegrator:
         Args:
             config_path: 配置文件路径
         """
-        with open(config_path, "r") as f:
-            self.config = yaml.safe_load(f)
+        self.config = _load_config(config_path)
 
         self.quality_thresholds = self.config.get("quality", {}).get("thresholds", {})
 
@@ -139,19 +323,24 @@ class DraftIntegrator:
         sections = {}
         for section_name, file_path in section_files.items():
             if Path(file_path).exists():
-                sections[section_name] = Path(file_path).read_text(encoding="utf-8")
+                sections[section_name] = _read_section_file(file_path)
             else:
                 print(f"警告: 找不到文件 {file_path}")
                 sections[section_name] = ""
 
         return sections
 
-    def validate_completeness(self, sections: Dict[str, str]) -> Dict[str, Any]:
+    def validate_completeness(
+        self,
+        sections: Dict[str, str],
+        word_counts: Optional[Dict[str, int]] = None,
+    ) -> Dict[str, Any]:
         """
         验证完整性
 
         Args:
             sections: 章节内容字典
+            word_counts: 预先计算好的各章节字数（可选）
 
         Returns:
             验证报告
@@ -163,7 +352,8 @@ class DraftIntegrator:
         ]
 
         # 计算字数
-        word_counts = {s: len(sections.get(s, "").split()) for s in sections}
+        if word_counts is None:
+            word_counts = _count_section_words(sections)
         total_words = sum(word_counts.values())
 
         return {
@@ -175,7 +365,10 @@ class DraftIntegrator:
         }
 
     def check_data_consistency(
-        self, sections: Dict[str, str], strict_mode: bool = False
+        self,
+        sections: Dict[str, str],
+        strict_mode: bool = False,
+        buffer: Optional[_SectionBuffer] = None,
     ) -> Tuple[List[ConsistencyIssue], Dict[str, Any]]:
         """
         检查数据一致性
@@ -183,6 +376,7 @@ class DraftIntegrator:
         Args:
             sections: 章节内容字典
             strict_mode: 严格模式
+            buffer: 已拼接的章节文本（可选，由 integrate 共享传入）
 
         Returns:
             (问题列表, 统计信息)
@@ -194,20 +388,32 @@ class DraftIntegrator:
             "terminology_occurrences": {},
         }
 
+        # 一次扫描全部章节，按位置把匹配结果归入对应章节
+        if buffer is None:
+            buffer = _SectionBuffer.from_sections(sections)
+        found = {
+            section: {kind: [] for kind in ("sample", "p_value") + REFERENCE_TERMS}
+            for section in sections
+        }
+        for match in CONSISTENCY_SCAN_RE.finditer(buffer.text):
+            kind = match.lastgroup
+            value = match.group("sample_value") if kind == "sample" else match.group()
+            found[buffer.section_at(match.start())][kind].append(value)
+
         # 提取样本量
-        sample_pattern = r"n\s*[=:]\s*(\d+)"
-        for section, content in sections.items():
-            matches = re.findall(sample_pattern, content)
+        for section in sections:
+            matches = found[section]["sample"]
             if matches:
+                value_counts = Counter(matches)
+                unique_values = list(value_counts)
                 stats["sample_size_mentions"].append(
-                    {"section": section, "values": list(set(matches))}
+                    {"section": section, "values": unique_values}
                 )
 
                 # 检查是否一致
-                unique_values = set(matches)
                 if len(unique_values) > 1:
                     # 取最常见的值
-                    most_common = max(set(matches), key=matches.count)
+                    most_common = value_counts.most_common(1)[0][0]
                     issues.append(
                         ConsistencyIssue(
                             type="numerical",
@@ -221,9 +427,8 @@ class DraftIntegrator:
                     )
 
         # 提取统计值
-        p_value_pattern = r"p\s*[<>=]\s*[\d.]+"
-        for section, content in sections.items():
-            matches = re.findall(p_value_pattern, content)
+        for section in sections:
+            matches = found[section]["p_value"]
             if matches:
                 stats["statistical_values"].append(
                     {
@@ -234,59 +439,43 @@ class DraftIntegrator:
 
         # 提取术语使用
         # 检测潜在的术语不一致
-        potential_terms = ["Table", "Figure"]
-        for term in potential_terms:
-            pattern = rf"{term}\s*\d+"
-            for section, content in sections.items():
-                matches = re.findall(pattern, content)
+        for term in REFERENCE_TERMS:
+            for section in sections:
+                matches = found[section][term]
                 if matches:
                     stats["terminology_occurrences"][term] = matches
 
         return issues, stats
 
     def check_terminology_consistency(
-        self, sections: Dict[str, str]
+        self, sections: Dict[str, str], buffer: Optional[_SectionBuffer] = None
     ) -> List[ConsistencyIssue]:
         """
         检查术语一致性
 
         Args:
             sections: 章节内容字典
+            buffer: 已拼接的章节文本（可选，由 integrate 共享传入）
 
         Returns:
             术语问题列表
         """
         issues = []
 
-        # 检测常见的术语变体
-        term_variants = {
-            "crop yield": [
-                "crop yield",
-                "Crop yield",
-                "crop yields",
-                "Crop yields",
-                "yields",
-            ],
-            "significant": [
-                "significant",
-                "Significant",
-                "significantly",
-                "Significantly",
-            ],
-            "control group": ["control group", "Control group", "control", "Control"],
-            "treatment group": [
-                "treatment group",
-                "Treatment group",
-                "treatment",
-                "Treatment",
-            ],
-        }
-
         # 合并所有文本
-        all_text = " ".join(sections.values()).lower()
+        if buffer is None:
+            buffer = _SectionBuffer.from_sections(sections)
+        all_text = buffer.text.lower()
+
+        # 找出全文中出现过的小写变体：优先用自动机一次扫描，否则逐个子串查找
+        automaton = self._get_term_automaton()
+        if automaton is not None:
+            present = {variant for _, variant in automaton.iter(all_text)}
+        else:
+            present = {key for key in self._TERM_VARIANT_KEYS if key in all_text}
 
-        for standard_term, variants in term_variants.items():
-            found_variants = [v for v in variants if v.lower() in all_text]
+        for standard_term, variants in self.TERM_VARIANTS.items():
+            found_variants = [v for v in variants if v.lower() in present]
             if len(found_variants) > 1:
                 issues.append(
                     ConsistencyIssue(
@@ -302,27 +491,132 @@ class DraftIntegrator:
 
         return issues
 
-    def analyze_transitions(self, sections: Dict[str, str]) -> Dict[str, Any]:
+    @classmethod
+    def _get_term_automaton(cls):
+        """获取术语变体的 Aho-Corasick 自动机，未安装 pyahocorasick 时返回 None"""
+        if cls._term_automaton is None:
+            try:
+                import ahocorasick
+            except ImportError:
+                cls._term_automaton = False
+            else:
+                automaton = ahocorasick.Automaton()
+                for key in cls._TERM_VARIANT_KEYS:
+                    automaton.add_word(key, key)
+                automaton.make_automaton()
+                cls._term_automaton = automaton
+
+        if cls._term_automaton is False:
+            return None
+        return cls._term_automaton
+
+    def _find_transition_words(self, content: str) -> List[str]:
+        """
+        找出文本中出现的过渡词（小写）
+
+        长文本在安装了 hyperscan 时改用其多模式DFA扫描，其余文本在安装了 google-re2
+        时改用 RE2 线性时间匹配，结果均与 _TRANSITION_RE 一致（仅词边界按ASCII判断）
+
+        Args:
+            content: 章节文本
+
+        Returns:
+            按出现顺序排列的过渡词列表
+        """
+        if len(content) >= HYPERSCAN_MIN_CHARS:
+            hs_db = self._get_transition_hs_db()
+            if hs_db is not None:
+                database, words = hs_db
+                events = []
+
+                def on_match(pattern_id, start, end, flags, context):
+                    events.append((start, -end, pattern_id))
+
+                database.scan(content.encode("utf-8"), match_event_handler=on_match)
+
+                # Hyperscan 会报告重叠的匹配；按 re 的规则保留最左、最长且互不重叠的匹配
+                found = []
+                last_end = -1
+                for start, neg_end, pattern_id in sorted(events):
+                    if start >= last_end:
+                        found.append(words[pattern_id])
+                        last_end = -neg_end
+                return found
+
+        pattern = self._get_transition_re2() or self._TRANSITION_RE
+        return list(map(str.lower, pattern.findall(content)))
+
+    @classmethod
+    def _get_transition_hs_db(cls):
+        """获取过渡词的 Hyperscan 数据库，未安装 hyperscan 时返回 None"""
+        if cls._transition_hs_db is None:
+            try:
+                import hyperscan
+            except ImportError:
+                cls._transition_hs_db = False
+            else:
+                words = list(cls._TRANSITION_WORD_CATEGORIES)
+                flags = hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SOM_LEFTMOST
+                database = hyperscan.Database()
+                database.compile(
+                    expressions=[rf"\b{re.escape(w)}\b".encode() for w in words],
+                    ids=list(range(len(words))),
+                    elements=len(words),
+                    flags=[flags] * len(words),
+                )
+                cls._transition_hs_db = (database, words)
+
+        if cls._transition_hs_db is False:
+            return None
+        return cls._transition_hs_db
+
+    @classmethod
+    def _get_transition_re2(cls):
+        """获取编译为 RE2 的过渡词模式，未安装 google-re2 时返回 None"""
+        if cls._transition_re2 is None:
+            try:
+                import re2
+            except ImportError:
+                cls._transition_re2 = False
+            else:
+                options = re2.Options()
+                options.case_sensitive = False
+                cls._transition_re2 = re2.compile(cls._TRANSITION_RE.pattern, options)
+
+        if cls._transition_re2 is False:
+            return None
+        return cls._transition_re2
+
+    def analyze_transitions(
+        self,
+        sections: Dict[str, str],
+        word_counts: Optional[Dict[str, int]] = None,
+    ) -> Dict[str, Any]:
         """
         分析过渡词
 
         Args:
             sections: 章节内容字典
+            word_counts: 预先计算好的各章节字数（可选）
 
         Returns:
             过渡分析结果
         """
-        transition_counts = {k: 0 for k in self.TRANSITION_WORDS}
+        transition_counts = dict.fromkeys(self._TRANSITION_CATEGORIES, 0)
 
-        for section, content in sections.items():
-            content_lower = content.lower()
-            for category, words in self.TRANSITION_WORDS.items():
-                for word in words:
-                    count = len(re.findall(r"\b" + word + r"\b", content_lower))
-                    transition_counts[category] += count
+        # 先在C层统计每个过渡词的出现次数，再按词分摊到所属类别
+        word_hits = Counter()
+        for content in sections.values():
+            word_hits.update(self._find_transition_words(content))
+
+        for word, count in word_hits.items():
+            for category in self._TRANSITION_WORD_CATEGORIES.get(word, ()):
+                transition_counts[category] += count
 
         # 计算过渡密度
-        total_words = sum(len(s.split()) for s in sections.values())
+        if word_counts is None:
+            word_counts = _count_section_words(sections)
+        total_words = sum(word_counts.values())
         total_transitions = sum(transition_counts.values())
         density = total_transitions / total_words if total_words > 0 else 0
 
@@ -334,21 +628,8 @@ class DraftIntegrator:
             next_section = section_order[i + 1]
             if sections.get(section) and sections.get(next_section):
                 # 检查前一章节最后一段是否有过渡到下一章节
-                last_para = (
-                    sections[section].strip().split("\n\n")[-1]
-                    if sections[section].strip()
-                    else ""
-                )
-                has_transition = any(
-                    word in last_para.lower()
-                    for word in [
-                        "subsequently",
-                        "therefore",
-                        "these results",
-                        "to examine",
-                        "we then",
-                    ]
-                )
+                last_para = sections[section].strip().rpartition("\n\n")[2]
+                has_transition = bool(CLOSING_TRANSITION_RE.search(last_para))
                 section_transitions[f"{section}->{next_section}"] = has_transition
 
         return {
@@ -369,7 +650,23 @@ class DraftIntegrator:
         Returns:
             增强后的章节
         """
+        improved, _ = self._improve_transitions(sections)
+        return improved
+
+    def _improve_transitions(
+        self, sections: Dict[str, str]
+    ) -> Tuple[Dict[str, str], Dict[str, int]]:
+        """
+        增强过渡词，并记录各章节因此新增的字数
+
+        Args:
+            sections: 章节内容字典
+
+        Returns:
+            (增强后的章节, 各章节新增字数)
+        """
         improved = sections.copy()
+        added_words = {}
 
         # 章节间过渡
         section_transitions = {
@@ -382,18 +679,15 @@ class DraftIntegrator:
         for section, transition in section_transitions.items():
             if improved.get(section):
                 content = improved[section].strip()
-                paragraphs = content.split("\n\n")
-                if paragraphs:
-                    # 在第一段添加过渡词
-                    first_para = paragraphs[0]
-                    if not any(
-                        word in first_para.lower()
-                        for word in ["however", "therefore", "furthermore"]
-                    ):
-                        paragraphs[0] = f"{transition} {first_para.lower()}"
-                    improved[section] = "\n\n".join(paragraphs)
+                # 只取第一段，无需切分整个章节
+                first_para, separator, rest = content.partition("\n\n")
+                # 在第一段添加过渡词
+                if not OPENING_TRANSITION_RE.search(first_para):
+                    content = f"{transition} {first_para.lower()}{separator}{rest}"
+                    added_words[section] = len(transition.split())
+                improved[section] = content
 
-        return improved
+        return improved, added_words
 
     def auto_fix_consistency(
         self, sections: Dict[str, str], issues: List[ConsistencyIssue]
@@ -424,18 +718,26 @@ class DraftIntegrator:
                         )
 
             elif issue.auto_fixed and issue.type == "terminology":
-                # 修复术语不一致
+                # 修复术语不一致：所有变体合并为一个模式（长词优先），一次替换完成
+                variants = sorted(
+                    {v.strip() for v in issue.original_value.split(", ") if v.strip()},
+                    key=len,
+                    reverse=True,
+                )
+                if not variants:
+                    continue
+                pattern = re.compile(
+                    r"\b(?:" + "|".join(map(re.escape, variants)) + r")\b"
+                )
+                standard_term = issue.suggested_value
+
                 for section, content in fixed.items():
                     if (
                         "全文" in issue.location
                         or issue.location.lower() in section.lower()
                     ):
                         # 替换为标准术语
-                        for variant in issue.original_value.split(", "):
-                            if variant.strip():
-                                fixed[section] = fixed[section].replace(
-                                    variant.strip(), issue.suggested_value
-                                )
+                        fixed[section] = pattern.sub(lambda _: standard_term, content)
 
         return fixed
 
@@ -455,8 +757,9 @@ class DraftIntegrator:
         report = IntegrationReport()
         report.integration_time = datetime.now().isoformat()
 
-        # 1. 验证完整性
-        completeness = self.validate_completeness(sections)
+        # 1. 验证完整性（各章节字数只计算一次，后续分析复用）
+        word_counts = _count_section_words(sections)
+        completeness = self.validate_completeness(sections, word_counts)
         report.structure_analysis = {
             "sections_present": completeness["sections_present"],
             "word_counts": completeness["word_counts"],
@@ -464,31 +767,71 @@ class DraftIntegrator:
         }
 
         # 2. 检查数据一致性
-        consistency_issues, consistency_stats = self.check_data_consistency(sections)
-        terminology_issues = self.check_terminology_consistency(sections)
+        buffer = _SectionBuffer.from_sections(sections)
+        consistency_issues, consistency_stats = self.check_data_consistency(
+            sections, buffer=buffer
+        )
+        terminology_issues = self.check_terminology_consistency(sections, buffer=buffer)
 
         all_issues = consistency_issues + terminology_issues
 
         # 自动修复
         fixed_sections = self.auto_fix_consistency(sections, all_issues)
 
+        # 一次遍历完成问题计数，并收集需要人工审查的问题
+        critical = warnings = auto_fixed = 0
+        issues_for_review = []
+        for issue in all_issues:
+            if issue.severity == "critical":
+                critical += 1
+            elif issue.severity == "warning":
+                warnings += 1
+            if issue.auto_fixed:
+                auto_fixed += 1
+            else:
+                issues_for_review.append(
+                    {
+                        "type": issue.type,
+                        "severity": issue.severity,
+                        "location": issue.location,
+                        "description": issue.description,
+                        "suggested_value": issue.suggested_value,
+                    }
+                )
+
         report.consistency_report = {
             "total_issues": len(all_issues),
-            "critical": len([i for i in all_issues if i.severity == "critical"]),
-            "warnings": len([i for i in all_issues if i.severity == "warning"]),
-            "auto_fixed": len([i for i in all_issues if i.auto_fixed]),
+            "critical": critical,
+            "warnings": warnings,
+            "auto_fixed": auto_fixed,
         }
 
         # 3. 分析过渡词
-        transition_analysis = self.analyze_transitions(fixed_sections)
+        # 未被自动修复改动的章节直接复用已统计的字数
+        fixed_word_counts = {
+            section: (
+                word_counts[section]
+                if content == sections.get(section)
+                else len(content.split())
+            )
+            for section, content in fixed_sections.items()
+        }
+        transition_analysis = self.analyze_transitions(
+            fixed_sections, fixed_word_counts
+        )
         report.transition_analysis = transition_analysis
 
         # 4. 增强过渡词
-        improved_sections = self.improve_transitions(fixed_sections)
+        improved_sections, added_words = self._improve_transitions(fixed_sections)
 
-        # 5. 生成完整草稿
-        draft = self._assemble_draft(improved_sections)
-        report.total_words = len(draft.split())
+        # 5. 生成完整草稿（字数由已统计的章节字数推算，无需再切分整篇草稿）
+        improved_word_counts = {
+            section: count + added_words.get(section, 0)
+            for section, count in fixed_word_counts.items()
+        }
+        draft, report.total_words = self._assemble_draft(
+            improved_sections, improved_word_counts
+        )
 
         # 6. 计算质量分数
         report.overall_quality_score = self._calculate_quality_score(report)
@@ -497,17 +840,7 @@ class DraftIntegrator:
         report.recommendations = self._generate_recommendations(report, all_issues)
 
         # 8. 保存问题清单
-        report.issues_for_review = [
-            {
-                "type": issue.type,
-                "severity": issue.severity,
-                "location": issue.location,
-                "description": issue.description,
-                "suggested_value": issue.suggested_value,
-            }
-            for issue in all_issues
-            if not issue.auto_fixed
-        ]
+        report.issues_for_review = issues_for_review
 
         # 保存输出
         if output_path:
@@ -515,15 +848,20 @@ class DraftIntegrator:
 
         return draft, report
 
-    def _assemble_draft(self, sections: Dict[str, str]) -> str:
+    def _assemble_draft(
+        self,
+        sections: Dict[str, str],
+        word_counts: Optional[Dict[str, int]] = None,
+    ) -> Tuple[str, int]:
         """
         组装完整草稿
 
         Args:
             sections: 章节内容字典
+            word_counts: 各章节字数（可选，缺失时现场统计）
 
         Returns:
-            完整草稿
+            (完整草稿, 总字数)
         """
         # 按标准顺序组装
         section_order = ["introduction", "methods", "results", "discussion"]
@@ -535,18 +873,23 @@ class DraftIntegrator:
         }
 
         draft_parts = []
+        total_words = 0
 
         for section in section_order:
             content = sections.get(section, "").strip()
             if content:
                 # 确保有标题
                 if not content.startswith("## "):
-                    draft_parts.append(
-                        section_titles.get(section, f"## {section.capitalize()}")
-                    )
+                    title = section_titles.get(section, f"## {section.capitalize()}")
+                    draft_parts.append(title)
+                    total_words += len(title.split())
                 draft_parts.append(content)
+                if word_counts is not None and section in word_counts:
+                    total_words += word_counts[section]
+                else:
+                    total_words += len(content.split())
 
-        return "\n\n".join(draft_parts)
+        return "\n\n".join(draft_parts), total_words
 
     def _calculate_quality_score(self, report: IntegrationReport) -> float:
         """
@@ -650,14 +993,25 @@ class DraftIntegrator:
             "recommendations": report.recommendations,
         }
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(report_dict, f, ensure_ascii=False, indent=2)
+        try:
+            import orjson
+        except ImportError:
+            with open(output_path, "w", encoding="utf-8") as f:
+                json.dump(report_dict, f, ensure_ascii=False, indent=2)
+        else:
+            # orjson 在C层完成编码，输出同样为UTF-8、缩进2格
+            Path(output_path).write_bytes(
+                orjson.dumps(
+                    report_dict, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+                )
+            )
 
 
 def integrate_sections(
     section_files: Dict[str, str],
     output_path: str,
     config_path: str = "config/config.yaml",
+    section_contents: Optional[Dict[str, str]] = None,
 ) -> Tuple[str, Dict]:
     """
     整合章节的便捷函数
@@ -666,14 +1020,24 @@ def integrate_sections(
         section_files: 章节文件路径字典
         output_path: 输出文件路径
         config_path: 配置文件路径
+        section_contents: 已在内存中的章节内容 {章节名: 内容}，
+            这些章节直接使用而不再从 section_files 读取
 
     Returns:
         (草稿路径, 报告字典)
     """
     integrator = DraftIntegrator(config_path)
 
-    # 收集章节
-    sections = integrator.collect_sections(section_files)
+    # 收集章节（内存中已有的章节无需经磁盘读回）
+    section_contents = section_contents or {}
+    sections = integrator.collect_sections(
+        {
+            name: path
+            for name, path in section_files.items()
+            if name not in section_contents
+        }
+    )
+    sections.update(section_contents)
 
     # 整合
     draft, report = integrator.integrate(sections, output_path)
@@ -2,18 +2,281 @@
 文献数据库管理器模块
 """
 
+import hashlib
 import json
 import re
 import sqlite3
-from dataclasses import dataclass, field
+import threading
+from dataclasses import dataclass, field, fields as dataclass_fields
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 
 import pandas as pd
 
+# 写入论文记录的SQL（导入时批量执行）
+PAPER_INSERT_SQL = """
+    INSERT OR REPLACE INTO papers
+    (wos_id, title, authors, journal, year, volume, issue, pages,
+     doi, abstract, keywords, cited_by, research_area)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# 论文表中由导入写入的列（与 PAPER_INSERT_SQL 的占位符顺序一致）
+PAPER_COLUMNS = (
+    "wos_id",
+    "title",
+    "authors",
+    "journal",
+    "year",
+    "volume",
+    "issue",
+    "pages",
+    "doi",
+    "abstract",
+    "keywords",
+    "cited_by",
+    "research_area",
+)
+
+# 读取论文时的列
+PAPER_SELECT_COLUMNS = ("id",) + PAPER_COLUMNS
+PAPER_SELECT_SQL = f"SELECT {', '.join(PAPER_SELECT_COLUMNS)} FROM papers"
+# 与全文索引表联接时需加表名限定（papers_fts 中有同名列）
+PAPER_QUALIFIED_COLUMNS = ", ".join(f"papers.{c}" for c in PAPER_SELECT_COLUMNS)
+
+# WOS导出Excel的列名 -> 论文字段
+WOS_EXCEL_COLUMNS = {
+    "Authors": "authors",
+    "Author": "authors",
+    "Title": "title",
+    "Journal": "journal",
+    "Book Title": "journal",
+    "Year": "year",
+    "Publication Year": "year",
+    "Volume": "volume",
+    "Issue": "issue",
+    "Pages": "pages",
+    "Page Range": "pages",
+    "DOI": "doi",
+    "Digital Object Identifier": "doi",
+    "Abstract": "abstract",
+    "Keywords": "keywords",
+    "Author Keywords": "keywords",
+    "Cited By": "cited_by",
+    "Times Cited": "cited_by",
+    "Research Area": "research_area",
+    "Web of Science ID": "wos_id",
+    "UT": "wos_id",
+}
+
+# 文本列写入数据库时的最大长度
+COLUMN_MAX_LENGTHS = {
+    "wos_id": 100,
+    "title": 500,
+    "authors": 1000,
+    "journal": 200,
+    "volume": 50,
+    "issue": 50,
+    "pages": 50,
+    "doi": 100,
+    "abstract": 5000,
+    "keywords": 500,
+    "research_area": 100,
+}
+
+# 每个连接建立后设置的性能参数（WAL日志模式持久保存在数据库文件中，见 _init_database）
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+    # INSERT OR REPLACE 删除旧行时也触发删除触发器，保持全文索引同步
+    "PRAGMA recursive_triggers=ON",
+)
+
+# 全文索引：论文表的外部内容FTS5表，以及保持其同步的触发器
+PAPERS_FTS_SQL = """
+    CREATE VIRTUAL TABLE papers_fts USING fts5(
+        title, abstract, keywords, authors,
+        content='papers', content_rowid='id'
+    )
+"""
+PAPERS_FTS_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS papers_fts_insert AFTER INSERT ON papers BEGIN
+        INSERT INTO papers_fts(rowid, title, abstract, keywords, authors)
+        VALUES (new.id, new.title, new.abstract, new.keywords, new.authors);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS papers_fts_delete AFTER DELETE ON papers BEGIN
+        INSERT INTO papers_fts(papers_fts, rowid, title, abstract, keywords, authors)
+        VALUES ('delete', old.id, old.title, old.abstract, old.keywords, old.authors);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS papers_fts_update AFTER UPDATE ON papers BEGIN
+        INSERT INTO papers_fts(papers_fts, rowid, title, abstract, keywords, authors)
+        VALUES ('delete', old.id, old.title, old.abstract, old.keywords, old.authors);
+        INSERT INTO papers_fts(rowid, title, abstract, keywords, authors)
+        VALUES (new.id, new.title, new.abstract, new.keywords, new.authors);
+    END
+    """,
+)
+
+# 作者姓氏表：每位作者一行，按 (lastname, paper_id) 主键做等值查找
+PAPERS_AUTHORS_SQL = """
+    CREATE TABLE IF NOT EXISTS papers_authors (
+        lastname TEXT NOT NULL,
+        paper_id INTEGER NOT NULL,
+        ordinal INTEGER NOT NULL,
+        PRIMARY KEY (lastname, paper_id, ordinal),
+        FOREIGN KEY (paper_id) REFERENCES papers(id)
+    ) WITHOUT ROWID
+"""
+
+# 删除（含 INSERT OR REPLACE 覆盖）论文时同步清理其作者行
+PAPERS_AUTHORS_TRIGGERS = (
+    "CREATE INDEX IF NOT EXISTS idx_papers_authors_paper ON papers_authors(paper_id)",
+    """
+    CREATE TRIGGER IF NOT EXISTS papers_authors_ad AFTER DELETE ON papers BEGIN
+        DELETE FROM papers_authors WHERE paper_id = old.id;
+    END
+    """,
+)
+
+# 预编译的正则表达式
+NON_ALPHA_RE = re.compile(r"[^a-zA-Z]")
+MULTI_SPACE_RE = re.compile(r" +")
+# 作者之间的分隔（WOS: "Wang, J; Liu, Q"，Excel: "Zhang, Y. and Wang, L."）
+AUTHOR_LIST_SEP_RE = re.compile(r";| and ")
+# WOS纯文本记录间的 ER 分隔行（容忍行尾空白）
+WOS_RECORD_SEP_RE = re.compile(r"\nER[ \t]*\n")
+# 导入时用到的字段；其余字段（如数百行的参考文献CR）解析时跳过
+WOS_IMPORT_TAGS = frozenset(
+    {"UT", "DI", "TI", "AB", "PY", "AF", "AU", "BP", "EP", "TC", "SO", "VL", "IS", "DE", "SC"}
+)
+# 关键词切分表：ASCII单词字符（字母、数字、下划线）保留，其余字节映射为空格，
+# 供 bytes.translate 使用；切分结果与 KEYWORD_RE 一致
+KEYWORD_TRANSLATE_TABLE = bytes.maketrans(
+    bytes(range(256)),
+    bytes(c if chr(c).isalnum() or c == 95 else 32 for c in range(128))
+    + b" " * 128,
+)
+KEYWORD_MIN_LENGTH = 4
+KEYWORD_RE = re.compile(r"\b[a-zA-Z]{4,}\b")
+FTS_TOKEN_RE = re.compile(r"\w+")
+# 关键词检索只匹配这些列（authors 列仅供按作者查找）
+FTS_KEYWORD_COLUMNS = "{title abstract keywords}"
+
+# 推荐引用时忽略的常见词
+STOPWORDS = frozenset(
+    {"this", "that", "with", "from", "have", "were", "which", "about"}
+)
+
+# 文中引用的解析模式（按顺序尝试）
+CITATION_PATTERNS = (
+    re.compile(r"(\w+)\s+et\s+al\.,?\s+(\d{4})"),  # Author et al., Year
+    re.compile(r"(\w+),?\s+(\d{4})"),  # Author, Year
+    re.compile(r"\[(\d+)\]"),  # [1]
+)
+
+# 各参考文献风格的BibTeX条目模板
+# APA: Author (Year). Title. Journal, Volume(Issue), Pages.
+# Vancouver: Author. Title. Journal. Year;Volume:Pages.
+BIBTEX_TEMPLATES = {
+    "apa": """@article{{{citekey},
+  author = {{{authors}}},
+  title = {{{title}}},
+  journal = {{{journal}}},
+  year = {{{year}}},
+  volume = {{{volume}}},
+  number = {{{issue}}},
+  pages = {{{pages}}},
+  doi = {{{doi}}}
+}}""",
+    "vancouver": """@article{{{citekey},
+  author = {{{authors}}},
+  title = {{{title}}},
+  journal = {{{journal}}},
+  year = {{{year}}},
+  volume = {{{volume}}},
+  pages = {{{pages}}}
+}}""",
+    "ieee": """@article{{{citekey},
+  author = {{{authors}}},
+  title = {{{title}}},
+  journal = {{{journal}}},
+  year = {{{year}}},
+  volume = {{{volume}}},
+  number = {{{issue}}},
+  pages = {{{pages}}},
+  doi = {{{doi}}}
+}}""",
+    "nature": """@article{{{citekey},
+  author = {{{authors}}},
+  title = {{{title}}},
+  journal = {{{journal}}},
+  year = {{{year}}},
+  volume = {{{volume}}},
+  number = {{{issue}}},
+  pages = {{{pages}}},
+  doi = {{{doi}}},
+  abstract = {{{abstract}}},
+}}""",
+}
+
+# BibTeX标题清理：去掉花括号，换行替换为空格
+TITLE_CLEAN_TABLE = str.maketrans({"{": "", "}": "", "\n": " "})
+
+
+def _author_lastnames(authors: str) -> List[str]:
+    """按顺序提取作者姓氏（小写）；"姓, 名" 取逗号前部分，否则取最后一个词"""
+    lastnames = []
+    for author in AUTHOR_LIST_SEP_RE.split(authors):
+        words = author.partition(",")[0].split()
+        if words:
+            lastnames.append(words[-1].lower())
+    return lastnames
+
+
+def _keyword_tokens(text: str) -> List[str]:
+    """
+    提取文本中由至少4个字母组成的词（小写）
+
+    纯ASCII文本用 bytes.translate 切分；含非ASCII字符时按 KEYWORD_RE 匹配，
+    两条路径结果一致（如 "CO2"、"naïve" 均不计入）
+    """
+    if not text.isascii():
+        return KEYWORD_RE.findall(text.lower())
+    return [
+        w
+        for w in text.lower()
+        .encode("ascii")
+        .translate(KEYWORD_TRANSLATE_TABLE)
+        .decode("ascii")
+        .split()
+        if len(w) >= KEYWORD_MIN_LENGTH and w.isalpha()
+    ]
+
+
+def _to_fts_query(query: str) -> str:
+    """
+    将用户输入的检索词转换为FTS5查询：每个词按前缀匹配，多个词需同时出现
+
+    Returns:
+        FTS5 MATCH 表达式；检索词中没有可用的词时返回空字符串
+    """
+    return " ".join(f'"{token}"*' for token in FTS_TOKEN_RE.findall(query))
+
 
-@dataclass
+def _fts_keyword_match(match_query: str) -> str:
+    """将FTS5查询限定在标题、摘要、关键词列"""
+    return f"{FTS_KEYWORD_COLUMNS}: ({match_query})"
+
+
+@dataclass(slots=True)
 class Paper:
     """论文数据类"""
 
@@ -58,36 +321,33 @@ class Paper:
         生成标准citekey格式: AuthorYYYY
         例如: Zhang2025, Smith2023
         如果作者名超过15字符，使用前15字符
+        结果保存在 citekey 字段中，后续调用直接返回
         """
+        if self.citekey:
+            return self.citekey
+
         # 提取第一作者姓氏
         first_author_lastname = ""
         if self.authors:
-            # 尝试多种格式
-            if ";" in self.authors:
-                first_author = self.authors.split(";")[0].strip()
-            elif "," in self.authors:
-                first_author = self.authors.split(",")[0].strip()
-            elif " and " in self.authors:
-                first_author = self.authors.split(" and ")[0].strip()
+            # 按 ; , and 的优先级截出第一作者（只切一刀）
+            for sep in (";", ",", " and "):
+                if sep in self.authors:
+                    first_author = self.authors.split(sep, 1)[0].strip()
+                    break
             else:
                 first_author = self.authors.strip()
 
-            # 提取姓氏（假设格式为 "Smith, John" 或 "John Smith"）
             if "," in first_author:
-                parts = first_author.split(",")
-                if len(parts) >= 1:
-                    first_author_lastname = parts[0].strip()
-                if len(parts) >= 2:
-                    # 可能是 "Smith, John" 格式
-                    first_author_lastname = parts[0].strip()
+                # "Van der Berg, J" 格式：逗号前整体为姓氏
+                first_author_lastname = first_author.split(",", 1)[0].strip()
             else:
-                # 可能是 "John Smith" 格式，取最后一个词
+                # "John Smith" 格式：取最后一个词
                 parts = first_author.split()
                 if parts:
                     first_author_lastname = parts[-1]
 
         # 清理姓氏，只保留字母
-        first_author_lastname = re.sub(r"[^a-zA-Z]", "", first_author_lastname)
+        first_author_lastname = NON_ALPHA_RE.sub("", first_author_lastname)
 
         # 限制长度
         first_author_lastname = first_author_lastname[:15]
@@ -101,9 +361,10 @@ class Paper:
 
         # 组合为 citekey
         if self.year > 0:
-            return f"{first_author_lastname}{self.year}"
+            self.citekey = f"{first_author_lastname}{self.year}"
         else:
-            return f"{first_author_lastname}"
+            self.citekey = f"{first_author_lastname}"
+        return self.citekey
 
     def format_citation(
         self, citation_style: str = "author-year", citekey: str = ""
@@ -146,65 +407,28 @@ class Paper:
         Returns:
             BibTeX条目字符串
         """
-        # 生成citekey
-        citekey = self.generate_citekey()
-
-        # 清理标题中的花括号和特殊字符
-        title = self.title.replace("{", "").replace("}", "").replace("\n", " ")
+        # 清理标题中的花括号和换行
+        title = self.title.translate(TITLE_CLEAN_TABLE)
 
         # 清理作者格式
         authors = self.authors.replace(";", " and ")
 
-        # 根据引用风格生成不同的BibTeX格式
-        if reference_format == "apa":
-            # APA风格: Author (Year). Title. Journal, Volume(Issue), Pages.
-            entry = f"""@article{{{citekey},
-  author = {{{authors}}},
-  title = {{{title}}},
-  journal = {{{self.journal}}},
-  year = {{{self.year}}},
-  volume = {{{self.volume}}},
-  number = {{{self.issue}}},
-  pages = {{{self.pages}}},
-  doi = {{{self.doi}}}
-}}"""
-        elif reference_format == "vancouver":
-            # Vancouver风格: Author. Title. Journal. Year;Volume:Pages.
-            entry = f"""@article{{{citekey},
-  author = {{{authors}}},
-  title = {{{title}}},
-  journal = {{{self.journal}}},
-  year = {{{self.year}}},
-  volume = {{{self.volume}}},
-  pages = {{{self.pages}}}
-}}"""
-        elif reference_format == "ieee":
-            # IEEE风格
-            entry = f"""@article{{{citekey},
-  author = {{{authors}}},
-  title = {{{title}}},
-  journal = {{{self.journal}}},
-  year = {{{self.year}}},
-  volume = {{{self.volume}}},
-  number = {{{self.issue}}},
-  pages = {{{self.pages}}},
-  doi = {{{self.doi}}}
-}}"""
-        else:
-            # Nature风格 (默认)
-            entry = f"""@article{{{citekey},
-  author = {{{authors}}},
-  title = {{{title}}},
-  journal = {{{self.journal}}},
-  year = {{{self.year}}},
-  volume = {{{self.volume}}},
-  number = {{{self.issue}}},
-  pages = {{{self.pages}}},
-  doi = {{{self.doi}}},
-  abstract = {{{self.abstract}}},
-}}"""
-
-        return entry
+        # 根据引用风格选择模板，未知风格按 Nature 处理
+        template = BIBTEX_TEMPLATES.get(reference_format, BIBTEX_TEMPLATES["nature"])
+        return template.format_map(
+            {
+                "citekey": self.generate_citekey(),
+                "authors": authors,
+                "title": title,
+                "journal": self.journal,
+                "year": self.year,
+                "volume": self.volume,
+                "issue": self.issue,
+                "pages": self.pages,
+                "doi": self.doi,
+                "abstract": self.abstract,
+            }
+        )
 
     def get_full_reference_info(
         self, reference_format: str = "nature"
@@ -229,7 +453,7 @@ class Paper:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class Citation:
     """引用数据类"""
 
@@ -239,24 +463,66 @@ class Citation:
     reference_format: str = ""  # 完整的参考文献格式
 
 
+# Paper 的字段名，用于从数据库行构造对象
+PAPER_FIELDS = frozenset(f.name for f in dataclass_fields(Paper))
+
+
 class LiteratureDatabaseManager:
     """文献数据库管理器"""
 
-    def __init__(self, db_path: str = "data/literature.db"):
+    def __init__(self, db_path: str = "data/literature.db", read_only: bool = False):
         """
         初始化管理器
 
         Args:
             db_path: 数据库文件路径
+            read_only: 以只读方式打开已有数据库（写作阶段只检索文献时使用）
         """
         self.db_path = Path(db_path)
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._init_database()
+        self.read_only = read_only
+        if not read_only:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # 所有方法复用同一个长连接；允许跨线程使用，由锁串行化访问
+        self._lock = threading.RLock()
+        self._conn = self._connect()
+        if read_only:
+            # 只读连接无法迁移表结构；旧版数据库缺少的索引表改用原有方式检索
+            self._fts_enabled = self._has_table("papers_fts")
+            self._authors_enabled = self._has_table("papers_authors")
+        else:
+            self._init_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        """打开数据库连接并设置性能参数"""
+        if self.read_only:
+            database = self.db_path.resolve().as_uri() + "?mode=ro"
+        else:
+            database = str(self.db_path)
+        conn = sqlite3.connect(database, uri=self.read_only, check_same_thread=False)
+        # 结果行按列名访问，转换为 Paper 时不依赖列的位置
+        conn.row_factory = sqlite3.Row
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def _has_table(self, name: str) -> bool:
+        """数据库中是否已有指定的表"""
+        return bool(
+            self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = ?", (name,)
+            ).fetchone()
+        )
 
     def _init_database(self) -> None:
         """初始化数据库表结构"""
-        conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.cursor()
+        cursor = self._conn.cursor()
+
+        # 新建数据库时使用8KB页（须在建表前设置，对已有数据库无效）
+        cursor.execute("PRAGMA page_size=8192")
+
+        # WAL模式：写入不阻塞读取，提交时无需每次同步整个数据库文件
+        cursor.execute("PRAGMA journal_mode=WAL")
 
         # 论文表
         cursor.execute("""
@@ -293,11 +559,44 @@ class LiteratureDatabaseManager:
         # 索引
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_year ON papers(year)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_journal ON papers(journal)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_doi ON papers(doi)")
+        # doi 的 UNIQUE 约束已自带索引，单独的 idx_doi 只会增加写入开销
+        cursor.execute("DROP INDEX IF EXISTS idx_doi")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_keywords ON papers(keywords)")
+        # 支撑 search 的 cited_by / year 排序
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_cited_by ON papers(cited_by)")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_year_cited ON papers(year DESC, cited_by DESC)"
+        )
 
-        conn.commit()
-        conn.close()
+        # 全文索引；SQLite未编译FTS5时退回 LIKE 检索
+        self._fts_enabled = True
+        has_fts = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'papers_fts'"
+        ).fetchone()
+        if not has_fts:
+            try:
+                cursor.execute(PAPERS_FTS_SQL)
+            except sqlite3.OperationalError:
+                self._fts_enabled = False
+            else:
+                # 为已有的论文建立索引
+                cursor.execute("INSERT INTO papers_fts(papers_fts) VALUES ('rebuild')")
+        if self._fts_enabled:
+            for trigger in PAPERS_FTS_TRIGGERS:
+                cursor.execute(trigger)
+
+        # 作者姓氏表；首次创建时为已有的论文补建
+        has_authors = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'papers_authors'"
+        ).fetchone()
+        cursor.execute(PAPERS_AUTHORS_SQL)
+        for statement in PAPERS_AUTHORS_TRIGGERS:
+            cursor.execute(statement)
+        if not has_authors:
+            self._index_authors(0)
+        self._authors_enabled = True
+
+        self._conn.commit()
 
     def import_from_wos_excel(self, excel_path: str) -> int:
         """
@@ -309,82 +608,37 @@ class LiteratureDatabaseManager:
         Returns:
             导入的论文数量
         """
-        df = pd.read_excel(excel_path)
+        # 只读取能映射到论文字段的列；WOS导出的其余几十列不进入DataFrame
+        read_kwargs = {"usecols": lambda column: column in WOS_EXCEL_COLUMNS}
+        try:
+            # calamine（Rust实现）解析xlsx远快于openpyxl；未安装或pandas版本过旧时退回默认引擎
+            df = pd.read_excel(excel_path, engine="calamine", **read_kwargs)
+        except (ImportError, ValueError):
+            df = pd.read_excel(excel_path, **read_kwargs)
 
         # 标准化列名
-        column_mapping = {
-            "Authors": "authors",
-            "Author": "authors",
-            "Title": "title",
-            "Journal": "journal",
-            "Book Title": "journal",
-            "Year": "year",
-            "Publication Year": "year",
-            "Volume": "volume",
-            "Issue": "issue",
-            "Pages": "pages",
-            "Page Range": "pages",
-            "DOI": "doi",
-            "Digital Object Identifier": "doi",
-            "Abstract": "abstract",
-            "Keywords": "keywords",
-            "Author Keywords": "keywords",
-            "Cited By": "cited_by",
-            "Times Cited": "cited_by",
-            "Research Area": "research_area",
-            "Web of Science ID": "wos_id",
-            "UT": "wos_id",
-        }
+        df = df.rename(columns=WOS_EXCEL_COLUMNS)
 
-        df = df.rename(columns=column_mapping)
+        # 多个原始列名可能映射到同一字段，保留第一列；缺失的字段补为空列
+        df = df.loc[:, ~df.columns.duplicated()].reindex(columns=PAPER_COLUMNS)
 
-        conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.cursor()
+        # 按列整体转换类型并截断长度，无需逐行处理
+        for column in ("year", "cited_by"):
+            df[column] = (
+                pd.to_numeric(df[column], errors="coerce").fillna(0).astype(int)
+            )
+        for column, max_length in COLUMN_MAX_LENGTHS.items():
+            df[column] = df[column].fillna("").astype(str).str.slice(0, max_length)
 
-        count = 0
-        for _, row in df.iterrows():
-            try:
-                # 确保年份是整数
-                year = int(row.get("year", 0)) if pd.notna(row.get("year")) else 0
+        # 缺失的唯一标识写入 NULL：UNIQUE 约束不限制 NULL，空值记录不会互相覆盖
+        for column in ("wos_id", "doi"):
+            df[column] = df[column].astype(object).where(df[column] != "", None)
 
-                cursor.execute(
-                    """
-                    INSERT OR REPLACE INTO papers 
-                    (wos_id, title, authors, journal, year, volume, issue, pages, 
-                     doi, abstract, keywords, cited_by, research_area)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                    (
-                        str(row.get("wos_id", ""))[:100],
-                        str(row.get("title", ""))[:500],
-                        str(row.get("authors", ""))[:1000],
-                        str(row.get("journal", ""))[:200],
-                        year,
-                        str(row.get("volume", ""))[:50],
-                        str(row.get("issue", ""))[:50],
-                        str(row.get("pages", ""))[:50],
-                        str(row.get("doi", ""))[:100],
-                        str(row.get("abstract", ""))[:5000]
-                        if pd.notna(row.get("abstract"))
-                        else "",
-                        str(row.get("keywords", ""))[:500]
-                        if pd.notna(row.get("keywords"))
-                        else "",
-                        int(row.get("cited_by", 0))
-                        if pd.notna(row.get("cited_by"))
-                        else 0,
-                        str(row.get("research_area", ""))[:100],
-                    ),
-                )
-                count += 1
-            except Exception as e:
-                print(f"导入论文失败: {row.get('title', 'Unknown')[:50]}... - {e}")
-                continue
+        rows = list(df.itertuples(index=False, name=None))
 
-        conn.commit()
-        conn.close()
+        self._insert_papers(rows)
 
-        return count
+        return len(rows)
 
     def import_from_wos_txt(self, txt_path: str) -> int:
         """
@@ -401,179 +655,160 @@ class LiteratureDatabaseManager:
         Returns:
             导入的论文数量
         """
-        import json
-        import hashlib
-
         # 读取文件内容
         with open(txt_path, "r", encoding="utf-8", errors="replace") as f:
             content = f.read()
 
         # 按 ER 切分记录
-        records = content.split("\nER\n")
+        records = WOS_RECORD_SEP_RE.split(content)
 
-        conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.cursor()
+        # 先解析出全部记录（跳过没有字段的空记录），再在一个事务中批量写入
+        rows = [row for row in map(self._wos_record_to_row, records) if row]
 
-        count = 0
+        self._insert_papers(rows)
 
-        for record in records:
-            if not record.strip():
-                continue
+        return len(rows)
 
+    def _insert_papers(self, rows: List[Tuple]) -> None:
+        """在一个事务中批量写入论文行，并为新写入的论文建立作者姓氏索引"""
+        with self._lock:
+            # 批量导入可随时重做，导入期间跳过同步以减少磁盘刷写
+            self._conn.execute("PRAGMA synchronous=OFF")
             try:
-                # 解析各字段
-                paper_id = self._extract_field(record, "UT")
-                doi = self._extract_field(record, "DI")
-                title = self._extract_field(record, "TI")
-                abstract = self._extract_field(record, "AB")
-                year_str = self._extract_field(record, "PY")
-
-                # 提取作者
-                authors_raw = self._extract_all_fields(record, "AU")
-                authors_full = self._extract_all_fields(record, "AF")
-
-                # 解析作者列表
-                if authors_full:
-                    authors = "; ".join(authors_full)
-                elif authors_raw:
-                    authors = "; ".join(authors_raw)
-                else:
-                    authors = ""
-
-                # 解析第一作者姓氏（用于引用）
-                first_author = ""
-                if authors_raw:
-                    first_author = authors_raw[0].split(",")[0].strip()
-                elif authors:
-                    first_author = authors.split(",")[0].strip().split()[-1]
+                with self._conn:
+                    # id 为 AUTOINCREMENT，本次写入（含覆盖）的行 id 都大于当前最大值
+                    last_id = self._conn.execute(
+                        "SELECT COALESCE(MAX(id), 0) FROM papers"
+                    ).fetchone()[0]
+                    self._conn.executemany(PAPER_INSERT_SQL, rows)
+                    self._index_authors(last_id)
+                    # 更新索引统计信息，供查询规划器在年份/期刊/作者条件间选择索引
+                    self._conn.execute("ANALYZE papers")
+                    self._conn.execute("ANALYZE papers_authors")
+            finally:
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+
+    def _index_authors(self, after_id: int) -> None:
+        """为 id 大于 after_id 的论文写入作者姓氏行（由调用方负责提交）"""
+        papers = self._conn.execute(
+            "SELECT id, authors FROM papers WHERE id > ?", (after_id,)
+        ).fetchall()
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO papers_authors (lastname, paper_id, ordinal) VALUES (?, ?, ?)",
+            (
+                (lastname, paper["id"], ordinal)
+                for paper in papers
+                for ordinal, lastname in enumerate(_author_lastnames(paper["authors"] or ""))
+            ),
+        )
 
-                # 年份处理
-                year = 0
-                if year_str:
-                    try:
-                        year = int(year_str[:4])
-                    except (ValueError, TypeError):
-                        year = 0
-
-                # 生成paper_id
-                if paper_id:
-                    paper_id_value = f"wos:{paper_id}"
-                elif doi:
-                    paper_id_value = f"doi:{doi}"
-                else:
-                    # 使用title+year生成稳定ID
-                    title_hash = hashlib.md5(f"{title}{year}".encode()).hexdigest()[:16]
-                    paper_id_value = f"hash:{title_hash}"
-
-                # 清洗摘要
-                abstract_cleaned = self._clean_abstract(abstract)
-
-                # 生成引用文本
-                if first_author and year > 0:
-                    citation_text = f"({first_author} et al., {year})"
-                elif authors and year > 0:
-                    citation_text = f"({authors.split(',')[0].strip()}, {year})"
-                else:
-                    citation_text = ""
-
-                # 提取其他字段
-                journal = self._extract_field(record, "SO")  # 期刊名是SO字段
-                volume = self._extract_field(record, "VL")
-                issue = self._extract_field(record, "IS")
-                pages = self._extract_field(record, "BP", "")
-                end_page = self._extract_field(record, "EP", "")
-                if pages and end_page:
-                    pages = f"{pages}-{end_page}"
-                keywords = self._extract_field(record, "DE", "")
-                research_area = self._extract_field(record, "SC", "")
-                cited_by_str = self._extract_field(record, "TC", "0")
-                try:
-                    cited_by = int(cited_by_str) if cited_by_str else 0
-                except ValueError:
-                    cited_by = 0
-
-                # 插入数据库
-                cursor.execute(
-                    """
-                    INSERT OR REPLACE INTO papers 
-                    (wos_id, title, authors, journal, year, volume, issue, pages, 
-                     doi, abstract, keywords, cited_by, research_area)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                    (
-                        paper_id_value[:100],
-                        title[:500] if title else "",
-                        authors[:1000] if authors else "",
-                        journal[:200] if journal else "",
-                        year,
-                        volume[:50] if volume else "",
-                        issue[:50] if issue else "",
-                        pages[:50] if pages else "",
-                        doi[:100] if doi else "",
-                        abstract_cleaned[:5000] if abstract_cleaned else "",
-                        keywords[:500] if keywords else "",
-                        cited_by,
-                        research_area[:100] if research_area else "",
-                    ),
-                )
-                count += 1
+    def _wos_record_to_row(self, record: str) -> Optional[Tuple]:
+        """
+        将一条WOS记录解析为论文表的一行
 
-            except Exception as e:
-                print(f"导入论文失败: {str(e)[:100]}")
-                continue
+        Returns:
+            按 PAPER_COLUMNS 顺序排列并截断长度的字段值；记录中没有任何字段时返回None
+        """
+        # 一次遍历拆出全部字段
+        fields = self._parse_wos_record(record)
+        if not fields:
+            return None
+
+        # 解析各字段
+        paper_id = self._join_field(fields, "UT")
+        doi = self._join_field(fields, "DI")
+        title = self._join_field(fields, "TI")
+        abstract = self._join_field(fields, "AB")
+        year_str = self._join_field(fields, "PY")
+
+        # 解析作者列表（每行一位作者，优先使用全名AF）
+        authors = "; ".join(
+            [a for a in fields.get("AF", ()) if a]
+            or [a for a in fields.get("AU", ()) if a]
+        )
 
-        conn.commit()
-        conn.close()
+        # 年份处理
+        year = 0
+        if year_str:
+            try:
+                year = int(year_str[:4])
+            except ValueError:
+                year = 0
 
-        return count
+        # 生成paper_id
+        if paper_id:
+            paper_id_value = f"wos:{paper_id}"
+        elif doi:
+            paper_id_value = f"doi:{doi}"
+        else:
+            # 使用title+year生成稳定ID（保持md5，已入库的 hash: ID 不变）
+            title_hash = hashlib.md5(
+                f"{title}{year}".encode(), usedforsecurity=False
+            ).hexdigest()[:16]
+            paper_id_value = f"hash:{title_hash}"
+
+        # 提取其他字段
+        pages = self._join_field(fields, "BP")
+        end_page = self._join_field(fields, "EP")
+        if pages and end_page:
+            pages = f"{pages}-{end_page}"
+        cited_by_str = self._join_field(fields, "TC", "0")
+        try:
+            cited_by = int(cited_by_str) if cited_by_str else 0
+        except ValueError:
+            cited_by = 0
+
+        return (
+            paper_id_value[:100],
+            title[:500],
+            authors[:1000],
+            self._join_field(fields, "SO")[:200],  # 期刊名是SO字段
+            year,
+            self._join_field(fields, "VL")[:50],
+            self._join_field(fields, "IS")[:50],
+            pages[:50],
+            doi[:100] or None,
+            abstract[:5000],  # _join_field 已合并换行和多余空白
+            self._join_field(fields, "DE")[:500],
+            cited_by,
+            self._join_field(fields, "SC")[:100],
+        )
 
-    def _extract_field(self, record: str, field: str, default: str = "") -> str:
+    def _parse_wos_record(self, record: str) -> Dict[str, List[str]]:
         """
-        从记录中提取单个字段值
+        单次遍历记录的各行，按字段名归集导入所需字段的值
 
-        WOS格式字段可能在行首或跨行，需要特殊处理
-        """
-        # WOS TXT格式：字段名后可能有多个空格，然后是内容
-        # 例如：PT xxx 或 AU xxx, xxx
-        pattern = rf"\n{field}\s+(.+?)(?=\n[A-Z]{{2}}\s+|\Z)"
-        match = re.search(pattern, record, re.DOTALL)
-
-        if match:
-            value = match.group(1).strip()
-            # 清理多余空白，保留科学符号
-            value = re.sub(r"\s+", " ", value)
-            return value
-
-        # 尝试匹配行首的字段
-        if record.startswith(f"{field} "):
-            lines = record.split("\n")
-            first_line = lines[0][len(field) + 1 :].strip()
-            return re.sub(r"\s+", " ", first_line)
-
-        return default
-
-    def _extract_all_fields(self, record: str, field: str) -> List[str]:
-        """
-        从记录中提取所有匹配的字段值（用于AU等可能有多个的字段）
-        """
-        values = []
-        pattern = rf"\n{field}\s+(.+?)(?=\n[A-Z]{{2}}\s+|\Z)"
-        matches = re.findall(pattern, record, re.DOTALL)
+        以 "XX " 开头的行开始一个新字段，以空格开头的续行追加到当前字段，
+        因此多值字段（如AU、AF）每行对应列表中的一个元素；
+        不在 WOS_IMPORT_TAGS 中的字段（如参考文献CR）连同续行一并跳过
 
-        for match in matches:
-            value = match.strip()
-            # 清理但保留格式
-            values.append(value)
+        Returns:
+            字段名 -> 各行的值（已去除首尾空白）
+        """
+        fields: Dict[str, List[str]] = {}
+        values: Optional[List[str]] = None
+
+        for line in record.split("\n"):
+            if len(line) >= 3 and line[2] == " " and line[:2].isupper():
+                tag = line[:2]
+                if tag in WOS_IMPORT_TAGS:
+                    values = fields.setdefault(tag, [])
+                    values.append(line[3:].strip())
+                else:
+                    values = None
+            elif values is not None and line.startswith(" "):
+                values.append(line.strip())
 
-        # 也检查行首
-        lines = record.split("\n")
-        for line in lines:
-            if line.startswith(f"{field} "):
-                value = line[len(field) + 1 :].strip()
-                if value and value not in values:
-                    values.append(value)
+        return fields
 
-        return values
+    def _join_field(
+        self, fields: Dict[str, List[str]], field: str, default: str = ""
+    ) -> str:
+        """将跨行的字段值合并为一行，并清理多余空白"""
+        lines = fields.get(field)
+        if not lines:
+            return default
+        return " ".join(" ".join(lines).split())
 
     def _clean_abstract(self, abstract: str) -> str:
         """
@@ -586,7 +821,7 @@ class LiteratureDatabaseManager:
         cleaned = abstract.replace("\n", " ")
 
         # 多个空格合并为单个
-        cleaned = re.sub(r" +", " ", cleaned)
+        cleaned = MULTI_SPACE_RE.sub(" ", cleaned)
 
         # 清理首尾空白
         cleaned = cleaned.strip()
@@ -618,16 +853,18 @@ class LiteratureDatabaseManager:
         Returns:
             匹配的论文列表
         """
-        conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.cursor()
-
-        sql = """
-            SELECT id, wos_id, title, authors, journal, year, volume, issue, 
-                   pages, doi, abstract, keywords, cited_by, research_area
-            FROM papers 
-            WHERE (title LIKE ? OR abstract LIKE ? OR keywords LIKE ?)
-        """
-        params = [f"%{query}%", f"%{query}%", f"%{query}%"]
+        sql = PAPER_SELECT_SQL + " WHERE 1 = 1"
+        params = []
+
+        # 关键词检索走全文索引，避免 LIKE '%q%' 全表扫描；
+        # 空检索词返回全部论文，只含符号（无可索引词）的检索词仍按 LIKE 匹配
+        match_query = _to_fts_query(query)
+        if self._fts_enabled and match_query:
+            sql += " AND id IN (SELECT rowid FROM papers_fts WHERE papers_fts MATCH ?)"
+            params.append(_fts_keyword_match(match_query))
+        elif query:
+            sql += " AND (title LIKE ? OR abstract LIKE ? OR keywords LIKE ?)"
+            params.extend([f"%{query}%"] * 3)
 
         if year_min:
             sql += " AND year >= ?"
@@ -650,66 +887,80 @@ class LiteratureDatabaseManager:
         else:
             sql += " ORDER BY year DESC"
 
-        sql += f" LIMIT {limit}"
+        # LIMIT 作为绑定参数，相同结构的查询可复用已编译的语句
+        sql += " LIMIT ?"
+        params.append(limit)
 
-        cursor.execute(sql, params)
-        rows = cursor.fetchall()
-        conn.close()
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
 
         return [self._row_to_paper(row) for row in rows]
 
-    def _row_to_paper(self, row: Tuple) -> Paper:
-        """将数据库行转换为Paper对象"""
-        return Paper(
-            id=row[0],
-            wos_id=row[1],
-            title=row[2],
-            authors=row[3],
-            journal=row[4],
-            year=row[5],
-            volume=row[6],
-            issue=row[7],
-            pages=row[8],
-            doi=row[9],
-            abstract=row[10],
-            keywords=row[11],
-            cited_by=row[12],
-            research_area=row[13],
-        )
+    def get_papers_by_author(
+        self, lastname: str, year: Optional[int] = None, limit: int = 10
+    ) -> List[Paper]:
+        """
+        按作者姓氏查找论文（不区分大小写的精确匹配）
 
-    def get_paper_by_id(self, paper_id: int) -> Optional[Paper]:
-        """根据ID获取论文"""
-        conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            SELECT id, wos_id, title, authors, journal, year, volume, issue, 
-                   pages, doi, abstract, keywords, cited_by, research_area
-            FROM papers WHERE id = ?
-        """,
-            (paper_id,),
-        )
-        row = cursor.fetchone()
-        conn.close()
+        Args:
+            lastname: 作者姓氏
+            year: 发表年份，为空时不限
+            limit: 返回数量限制
+
+        Returns:
+            论文列表，按年份、引用数降序
+        """
+        if self._authors_enabled:
+            sql = (
+                PAPER_SELECT_SQL
+                + " WHERE id IN (SELECT paper_id FROM papers_authors WHERE lastname = ?)"
+            )
+            params: List[Any] = [lastname.lower()]
+        else:
+            # 只读打开的旧版数据库没有姓氏表，按作者字段模糊匹配
+            sql = PAPER_SELECT_SQL + " WHERE authors LIKE ?"
+            params = [f"%{lastname}%"]
+        if year:
+            sql += " AND year = ?"
+            params.append(year)
+        sql += " ORDER BY year DESC, cited_by DESC LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        return [self._row_to_paper(row) for row in rows]
+
+    def _row_to_paper(self, row: sqlite3.Row) -> Paper:
+        """将数据库行转换为Paper对象（忽略 Paper 没有的列）"""
+        values = {key: row[key] for key in row.keys() if key in PAPER_FIELDS}
+        # 缺失的唯一标识以 NULL 存储
+        values["wos_id"] = values.get("wos_id") or ""
+        values["doi"] = values.get("doi") or ""
+        return Paper(**values)
+
+    def _fetch_paper(self, condition: str, params: Tuple) -> Optional[Paper]:
+        """
+        按条件读取一篇论文
+
+        Args:
+            condition: WHERE 之后的SQL条件
+            params: 条件中的绑定参数
+        """
+        with self._lock:
+            row = self._conn.execute(
+                f"{PAPER_SELECT_SQL} WHERE {condition}", params
+            ).fetchone()
 
         return self._row_to_paper(row) if row else None
 
+    def get_paper_by_id(self, paper_id: int) -> Optional[Paper]:
+        """根据ID获取论文"""
+        return self._fetch_paper("id = ?", (paper_id,))
+
     def get_paper_by_doi(self, doi: str) -> Optional[Paper]:
         """根据DOI获取论文"""
-        conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            SELECT id, wos_id, title, authors, journal, year, volume, issue, 
-                   pages, doi, abstract, keywords, cited_by, research_area
-            FROM papers WHERE doi = ?
-        """,
-            (doi,),
-        )
-        row = cursor.fetchone()
-        conn.close()
-
-        return self._row_to_paper(row) if row else None
+        return self._fetch_paper("doi = ?", (doi,))
 
     def format_citation(self, paper: Paper, style: str = "author-year") -> str:
         """
@@ -776,17 +1027,50 @@ class LiteratureDatabaseManager:
             推荐引用列表
         """
         # 提取关键词
-        words = re.findall(r"\b[a-zA-Z]{4,}\b", text.lower())
-        keywords = [
-            w
-            for w in words
-            if w
-            not in ["this", "that", "with", "from", "have", "were", "which", "about"]
-        ]
-        keyword_query = " ".join(set(keywords[:5]))
-
-        # 搜索相关论文
-        papers = self.search(keyword_query, limit=limit, order_by="cited_by")
+        words = _keyword_tokens(text)
+        keywords = [w for w in words if w not in STOPWORDS]
+        keyword_set = set(keywords[:5])
+
+        if not self._fts_enabled:
+            return self._find_citations_by_title(words, keyword_set, limit)
+
+        # 任一关键词命中即可，由 BM25 在SQLite中完成相关度排序
+        match_query = " OR ".join(_to_fts_query(w) for w in keyword_set)
+        if not match_query:
+            return []
+
+        with self._lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT {PAPER_QUALIFIED_COLUMNS}, bm25(papers_fts) AS score
+                FROM papers_fts JOIN papers ON papers.id = papers_fts.rowid
+                WHERE papers_fts MATCH ?
+                ORDER BY score
+                LIMIT ?
+            """,
+                (_fts_keyword_match(match_query), limit),
+            ).fetchall()
+
+        result = []
+        for row in rows:
+            paper = self._row_to_paper(row)
+            result.append(
+                {
+                    "paper": paper,
+                    "in_text_citation": self.format_citation(paper),
+                    "reference": self.format_reference(paper),
+                    # bm25() 越小越相关，取负数使分数越大越相关
+                    "relevance_score": -row["score"],
+                }
+            )
+
+        return result
+
+    def _find_citations_by_title(
+        self, words: List[str], keyword_set: Set[str], limit: int
+    ) -> List[Dict]:
+        """未启用全文索引时的推荐方式：按关键词检索后以标题词重合度排序"""
+        papers = self.search(" ".join(keyword_set), limit=limit, order_by="cited_by")
 
         result = []
         for paper in papers:
@@ -819,23 +1103,17 @@ class LiteratureDatabaseManager:
             (是否存在, 对应论文, 错误信息)
         """
         # 解析引用
-        patterns = [
-            r"(\w+)\s+et\s+al\.,?\s+(\d{4})",  # Author et al., Year
-            r"(\w+),?\s+(\d{4})",  # Author, Year
-            r"\[(\d+)\]",  # [1]
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, citation_text)
+        for pattern in CITATION_PATTERNS:
+            match = pattern.search(citation_text)
             if match:
-                if pattern.startswith(r"\["):
+                if pattern.pattern.startswith(r"\["):
                     paper_id = int(match.group(1))
                     paper = self.get_paper_by_id(paper_id)
                 else:
                     author = match.group(1)
                     year = int(match.group(2))
-                    # 搜索匹配的论文
-                    papers = self.search(author, limit=10, year_min=year, year_max=year)
+                    # 按作者姓氏索引查找
+                    papers = self.get_papers_by_author(author, year, limit=1)
                     if papers:
                         return True, papers[0], ""
                     else:
@@ -845,39 +1123,61 @@ class LiteratureDatabaseManager:
 
     def get_statistics(self) -> Dict[str, Any]:
         """获取数据库统计信息"""
-        conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.cursor()
-
         stats = {}
 
-        # 总论文数
-        cursor.execute("SELECT COUNT(*) FROM papers")
-        stats["total_papers"] = cursor.fetchone()[0]
+        with self._lock:
+            cursor = self._conn.cursor()
 
-        # 年份分布（排除year=0的无效数据）
-        cursor.execute(
-            "SELECT year, COUNT(*) FROM papers WHERE year > 0 GROUP BY year ORDER BY year"
-        )
-        stats["year_distribution"] = dict(cursor.fetchall())
+            # 四个查询放在同一个读事务中：共用一次快照，只获取一次读锁
+            cursor.execute("BEGIN")
+            try:
+                # 总论文数
+                cursor.execute("SELECT COUNT(*) FROM papers")
+                stats["total_papers"] = cursor.fetchone()[0]
 
-        # 期刊分布
-        cursor.execute(
-            'SELECT journal, COUNT(*) FROM papers WHERE journal != "" GROUP BY journal ORDER BY COUNT(*) DESC LIMIT 10'
-        )
-        stats["top_journals"] = dict(cursor.fetchall())
+                # 年份分布（排除year=0的无效数据）
+                cursor.execute(
+                    "SELECT year, COUNT(*) FROM papers WHERE year > 0 GROUP BY year ORDER BY year"
+                )
+                stats["year_distribution"] = dict(cursor.fetchall())
 
-        # 高引用论文
-        cursor.execute(
-            "SELECT title, cited_by FROM papers ORDER BY cited_by DESC LIMIT 5"
-        )
-        stats["top_cited"] = [
-            {"title": r[0], "cited_by": r[1]} for r in cursor.fetchall()
-        ]
+                # 期刊分布
+                cursor.execute(
+                    "SELECT journal, COUNT(*) FROM papers WHERE journal != '' GROUP BY journal ORDER BY COUNT(*) DESC LIMIT 10"
+                )
+                stats["top_journals"] = dict(cursor.fetchall())
 
-        conn.close()
+                # 高引用论文
+                cursor.execute(
+                    "SELECT title, cited_by FROM papers ORDER BY cited_by DESC LIMIT 5"
+                )
+                stats["top_cited"] = [
+                    {"title": r[0], "cited_by": r[1]} for r in cursor.fetchall()
+                ]
+            finally:
+                cursor.execute("COMMIT")
 
         return stats
 
+    def _iter_papers(self, paper_ids: Optional[List[int]] = None) -> Iterator[Paper]:
+        """
+        逐条读取论文，游标按需取行，不一次性加载全部结果
+
+        Args:
+            paper_ids: 要读取的论文ID列表，None表示全部
+        """
+        with self._lock:
+            if paper_ids:
+                placeholders = ",".join("?" * len(paper_ids))
+                cursor = self._conn.execute(
+                    f"{PAPER_SELECT_SQL} WHERE id IN ({placeholders})", paper_ids
+                )
+            else:
+                cursor = self._conn.execute(PAPER_SELECT_SQL)
+
+            for row in cursor:
+                yield self._row_to_paper(row)
+
     def export_to_bibtex(
         self, paper_ids: Optional[List[int]] = None, output_path: Optional[str] = None
     ) -> str:
@@ -891,28 +1191,10 @@ class LiteratureDatabaseManager:
         Returns:
             BibTeX内容
         """
-        conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.cursor()
-
-        if paper_ids:
-            placeholders = ",".join("?" * len(paper_ids))
-            cursor.execute(
-                f"SELECT * FROM papers WHERE id IN ({placeholders})", paper_ids
-            )
-        else:
-            cursor.execute("SELECT * FROM papers")
-
-        bibtex_entries = []
-        for row in cursor.fetchall():
-            paper = self._row_to_paper(row)
-
-            # 使用新的to_bibtex方法
-            bibtex_entry = paper.to_bibtex()
-            bibtex_entries.append(bibtex_entry)
-
-        conn.close()
-
-        bibtex_content = "\n\n".join(bibtex_entries)
+        # 逐行读取游标生成条目，不先取出全部结果行
+        bibtex_content = "\n\n".join(
+            paper.to_bibtex() for paper in self._iter_papers(paper_ids)
+        )
 
         if output_path:
             Path(output_path).write_text(bibtex_content, encoding="utf-8")
@@ -929,20 +1211,8 @@ class LiteratureDatabaseManager:
         Returns:
             格式化的文献信息字符串
         """
-        conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.cursor()
-
-        if paper_ids:
-            placeholders = ",".join("?" * len(paper_ids))
-            cursor.execute(
-                f"SELECT * FROM papers WHERE id IN ({placeholders})", paper_ids
-            )
-        else:
-            cursor.execute("SELECT * FROM papers")
-
         references = []
-        for row in cursor.fetchall():
-            paper = self._row_to_paper(row)
+        for paper in self._iter_papers(paper_ids):
             info = paper.get_full_reference_info()
 
             ref_text = f"""
@@ -957,8 +1227,6 @@ abstract:
 """
             references.append(ref_text)
 
-        conn.close()
-
         return "\n".join(references)
 
     def search_with_citekeys(
@@ -1004,8 +1272,9 @@ abstract:
         return papers
 
     def close(self) -> None:
-        """关闭数据库连接（预留）"""
-        pass
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
 
 
 def create_literature_database(
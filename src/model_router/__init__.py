@@ -4,12 +4,33 @@ Model Router - Multi-Provider AI Model Router
 """
 
 import json
+import random
+import sqlite3
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Tuple
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
 from enum import Enum
+from hashlib import blake2b
+from pathlib import Path
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    # orjson 在C层完成JSON编解码，长消息历史和长回复更快
+    from orjson import dumps as _json_dumps, loads as _json_loads
+except ImportError:
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+    _json_loads = json.loads
 
 
 class TaskType(Enum):
@@ -36,7 +57,7 @@ class Provider(Enum):
     LOCAL = "local"
 
 
-@dataclass
+@dataclass(slots=True)
 class ModelConfig:
     """模型配置"""
 
@@ -48,9 +69,23 @@ class ModelConfig:
     cost_per_1k_output: float = 0.0
     strengths: List[str] = field(default_factory=list)
     weaknesses: List[str] = field(default_factory=list)
+    # 每token单价，由千token单价预先换算
+    cost_per_input_token: float = field(init=False, repr=False)
+    cost_per_output_token: float = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.cost_per_input_token = self.cost_per_1k_input / 1000
+        self.cost_per_output_token = self.cost_per_1k_output / 1000
+
+    def cost(self, input_tokens: int, output_tokens: int) -> float:
+        """按token数计算费用"""
+        return (
+            input_tokens * self.cost_per_input_token
+            + output_tokens * self.cost_per_output_token
+        )
 
 
-@dataclass
+@dataclass(slots=True)
 class ModelResponse:
     """模型响应"""
 
@@ -63,19 +98,26 @@ class ModelResponse:
     cost: float
 
 
-# 默认模型配置
-DEFAULT_MODELS = {
-    TaskType.STYLE_ANALYSIS: ModelConfig(
+# 模型配置表（按模型名，价格与上下文长度只在此维护一处）
+MODEL_TABLE = {
+    "gpt-4o": ModelConfig(
         name="gpt-4o",
         provider=Provider.OPENAI,
         context_length=128000,
         max_output_tokens=4096,
         cost_per_1k_input=0.005,
         cost_per_1k_output=0.015,
-        strengths=["complex analysis", "pattern recognition", "nuanced understanding"],
+        strengths=[
+            "complex analysis",
+            "pattern recognition",
+            "nuanced understanding",
+            "numerical reasoning",
+            "data interpretation",
+            "analytical writing",
+        ],
         weaknesses=["cost"],
     ),
-    TaskType.LITERATURE_IMPORT: ModelConfig(
+    "claude-sonnet-4": ModelConfig(
         name="claude-sonnet-4",
         provider=Provider.ANTHROPIC,
         context_length=200000,
@@ -86,40 +128,16 @@ DEFAULT_MODELS = {
             "structured extraction",
             "consistent formatting",
             "semantic understanding",
+            "technical precision",
+            "structured output",
+            "accurate terminology",
+            "thorough analysis",
+            "consistency checking",
+            "logical flow",
         ],
-        weaknesses=["slower than alternatives"],
-    ),
-    TaskType.INTRO_WRITING: ModelConfig(
-        name="deepseek-chat",
-        provider=Provider.DEEPSEEK,
-        context_length=128000,
-        max_output_tokens=4096,
-        cost_per_1k_input=0.00014,
-        cost_per_1k_output=0.00028,
-        strengths=["creative writing", "cost-effective", "coherent narratives"],
-        weaknesses=["less precise for technical content"],
-    ),
-    TaskType.METHODS_WRITING: ModelConfig(
-        name="claude-sonnet-4",
-        provider=Provider.ANTHROPIC,
-        context_length=200000,
-        max_output_tokens=8192,
-        cost_per_1k_input=0.003,
-        cost_per_1k_output=0.015,
-        strengths=["technical precision", "structured output", "accurate terminology"],
-        weaknesses=["cost"],
+        weaknesses=["slower than alternatives", "cost"],
     ),
-    TaskType.RESULTS_WRITING: ModelConfig(
-        name="gpt-4o",
-        provider=Provider.OPENAI,
-        context_length=128000,
-        max_output_tokens=4096,
-        cost_per_1k_input=0.005,
-        cost_per_1k_output=0.015,
-        strengths=["numerical reasoning", "data interpretation", "analytical writing"],
-        weaknesses=["cost"],
-    ),
-    TaskType.DISCUSSION_WRITING: ModelConfig(
+    "claude-3-5-sonnet": ModelConfig(
         name="claude-3-5-sonnet",
         provider=Provider.ANTHROPIC,
         context_length=200000,
@@ -129,17 +147,22 @@ DEFAULT_MODELS = {
         strengths=["nuanced reasoning", "argumentation", "literature synthesis"],
         weaknesses=["cost"],
     ),
-    TaskType.INTEGRATION: ModelConfig(
-        name="claude-sonnet-4",
-        provider=Provider.ANTHROPIC,
-        context_length=200000,
-        max_output_tokens=8192,
-        cost_per_1k_input=0.003,
-        cost_per_1k_output=0.015,
-        strengths=["thorough analysis", "consistency checking", "logical flow"],
-        weaknesses=["cost"],
+    "deepseek-chat": ModelConfig(
+        name="deepseek-chat",
+        provider=Provider.DEEPSEEK,
+        context_length=128000,
+        max_output_tokens=4096,
+        cost_per_1k_input=0.00014,
+        cost_per_1k_output=0.00028,
+        strengths=[
+            "creative writing",
+            "cost-effective",
+            "coherent narratives",
+            "general purpose",
+        ],
+        weaknesses=["less precise for technical content", "less specialized"],
     ),
-    TaskType.CITATION_VALIDATION: ModelConfig(
+    "deepseek-reasoner": ModelConfig(
         name="deepseek-reasoner",
         provider=Provider.DEEPSEEK,
         context_length=128000,
@@ -149,16 +172,24 @@ DEFAULT_MODELS = {
         strengths=["reasoning", "fact-checking", "cost-effective"],
         weaknesses=["less creative"],
     ),
-    TaskType.GENERAL: ModelConfig(
-        name="deepseek-chat",
-        provider=Provider.DEEPSEEK,
-        context_length=128000,
-        max_output_tokens=4096,
-        cost_per_1k_input=0.00014,
-        cost_per_1k_output=0.00028,
-        strengths=["general purpose", "cost-effective"],
-        weaknesses=["less specialized"],
-    ),
+}
+
+# 任务类型 -> 模型名
+TASK_TO_MODEL = {
+    TaskType.STYLE_ANALYSIS: "gpt-4o",
+    TaskType.LITERATURE_IMPORT: "claude-sonnet-4",
+    TaskType.INTRO_WRITING: "deepseek-chat",
+    TaskType.METHODS_WRITING: "claude-sonnet-4",
+    TaskType.RESULTS_WRITING: "gpt-4o",
+    TaskType.DISCUSSION_WRITING: "claude-3-5-sonnet",
+    TaskType.INTEGRATION: "claude-sonnet-4",
+    TaskType.CITATION_VALIDATION: "deepseek-reasoner",
+    TaskType.GENERAL: "deepseek-chat",
+}
+
+# 默认模型配置（任务类型 -> 模型配置，同一模型共用一个配置对象）
+DEFAULT_MODELS = {
+    task_type: MODEL_TABLE[name] for task_type, name in TASK_TO_MODEL.items()
 }
 
 # 备用模型配置（用于故障转移）
@@ -174,6 +205,67 @@ FALLBACK_MODELS = {
 }
 
 
+# HTTP连接池大小（同一代理地址复用连接，避免每次请求重新握手）
+POOL_CONNECTIONS = 8
+POOL_MAXSIZE = 32
+# 批量处理任务时的最大并发数
+MAX_BATCH_WORKERS = 8
+# 可自动重试的HTTP状态码：模型调用是会计费的非幂等POST，只重试服务端明确未处理的限流响应；
+# 5xx 可能在服务端已生成回复后才由网关返回，交给备用模型链处理而不重发
+RETRY_STATUS_CODES = (429,)
+# 重试退避：第n次重试等待 RETRY_BACKOFF * 2**n 秒，并叠加随机抖动，避免并发请求同时重试
+RETRY_BACKOFF = 0.5
+RETRY_JITTER = 0.25
+# 每个提供商同时进行的请求数上限
+DEFAULT_PROVIDER_CONCURRENCY = 4
+# 模型响应缓存表（键为模型名、参数与消息的哈希）
+LLM_CACHE_SQL = """
+    CREATE TABLE IF NOT EXISTS llm_cache (
+        key BLOB PRIMARY KEY,
+        content TEXT NOT NULL,
+        input_tokens INTEGER NOT NULL,
+        output_tokens INTEGER NOT NULL
+    )
+"""
+# 通过代理以OpenAI兼容的SSE流式接口返回的提供商
+STREAMING_PROVIDERS = frozenset(
+    {Provider.OPENAI, Provider.ANTHROPIC, Provider.DEEPSEEK}
+)
+
+
+# tiktoken编码按模型名缓存；cl100k_base 等编码首次使用时需下载BPE文件，
+# 因此在后台线程加载，加载完成前或加载失败（未安装、离线）时按字符数估算
+_token_encodings: Dict[str, Any] = {}
+_token_encodings_lock = threading.Lock()
+
+
+def _load_token_encoding(model_name: str) -> None:
+    """加载模型对应的tiktoken编码；非OpenAI模型使用 cl100k_base 近似"""
+    try:
+        import tiktoken
+
+        try:
+            encoding = tiktoken.encoding_for_model(model_name)
+        except KeyError:
+            encoding = tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return
+    _token_encodings[model_name] = encoding
+
+
+def _get_token_encoding(model_name: str) -> Optional[Any]:
+    """返回已加载的tiktoken编码；尚未加载时在后台开始加载并返回None"""
+    with _token_encodings_lock:
+        if model_name in _token_encodings:
+            return _token_encodings[model_name]
+        # 占位：加载中或加载失败时保持None，每个模型只尝试加载一次
+        _token_encodings[model_name] = None
+    threading.Thread(
+        target=_load_token_encoding, args=(model_name,), daemon=True
+    ).start()
+    return None
+
+
 class ModelRouter:
     """
     模型路由器 - 智能选择最佳模型处理任务
@@ -186,6 +278,9 @@ class ModelRouter:
         default_timeout: int = 120,
         enable_fallback: bool = True,
         max_retries: int = 2,
+        cache_path: Optional[str] = None,
+        http2: bool = False,
+        provider_concurrency: Optional[Dict[Provider, int]] = None,
     ):
         """
         初始化模型路由器
@@ -196,6 +291,11 @@ class ModelRouter:
             default_timeout: 默认超时时间
             enable_fallback: 是否启用故障转移
             max_retries: 最大重试次数
+            cache_path: 响应缓存数据库路径（如 data/llm_cache.db），为空时不缓存
+            http2: 是否通过 httpx 使用HTTP/2（并发调用复用同一连接；
+                需安装 httpx[http2]，否则退回 requests）
+            provider_concurrency: 各提供商的并发请求上限，未指定的提供商
+                使用 DEFAULT_PROVIDER_CONCURRENCY
         """
         print(f"[DEBUG] ModelRouter init received base_url='{base_url}'")
         self.base_url = base_url.rstrip("/")
@@ -208,6 +308,76 @@ class ModelRouter:
         self.model_configs = DEFAULT_MODELS.copy()
         self.fallback_models = FALLBACK_MODELS.copy()
 
+        # 复用连接的会话；重试由连接适配器按退避策略完成
+        # max_retries 为总尝试次数，Retry.total 只计重试
+        # 只重试连接失败与429（请求未送达或未被处理）；读取超时等请求已发出的错误不重发
+        # 429 响应带有 Retry-After 时按其等待（urllib3 默认遵循该响应头）
+        retry_kwargs = dict(
+            total=max(self.max_retries - 1, 0),
+            read=0,
+            other=0,
+            backoff_factor=RETRY_BACKOFF,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset({"POST"}),
+        )
+        try:
+            retry = Retry(backoff_jitter=RETRY_JITTER, **retry_kwargs)
+        except TypeError:
+            # urllib3 < 2.0 不支持抖动
+            retry = Retry(**retry_kwargs)
+        adapter = HTTPAdapter(
+            pool_connections=POOL_CONNECTIONS,
+            pool_maxsize=POOL_MAXSIZE,
+            max_retries=retry,
+        )
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        # 可选的HTTP/2客户端；HTTP/2需经TLS协商，只对 https 地址生效
+        self._http2_client = None
+        self._http_errors: Tuple[type, ...] = (requests.exceptions.RequestException,)
+        if http2:
+            try:
+                import httpx
+
+                self._http2_client = httpx.Client(
+                    http2=True,
+                    timeout=self.default_timeout,
+                    limits=httpx.Limits(
+                        max_connections=POOL_CONNECTIONS * 2,
+                        max_keepalive_connections=POOL_CONNECTIONS,
+                    ),
+                    transport=httpx.HTTPTransport(
+                        http2=True, retries=max(self.max_retries - 1, 0)
+                    ),
+                )
+            except ImportError:
+                print("[WARNING] httpx[http2] 未安装，使用 requests 发送请求")
+            else:
+                self._http_errors += (httpx.HTTPError,)
+
+        # 按提供商限制并发，批量调用时不会同时压向同一家的速率限制
+        limits = provider_concurrency or {}
+        self._provider_semaphores = {
+            provider: threading.BoundedSemaphore(
+                limits.get(provider, DEFAULT_PROVIDER_CONCURRENCY)
+            )
+            for provider in Provider
+        }
+
+        # 批量并发调用时保护统计信息
+        self._stats_lock = threading.Lock()
+
+        # 响应缓存：相同模型、参数和消息的调用直接返回已有结果，重跑流程时不再重复计费
+        self._cache_conn = None
+        self._cache_lock = threading.Lock()
+        if cache_path:
+            Path(cache_path).parent.mkdir(parents=True, exist_ok=True)
+            self._cache_conn = sqlite3.connect(cache_path, check_same_thread=False)
+            self._cache_conn.execute(LLM_CACHE_SQL)
+            self._cache_conn.commit()
+
         # 统计信息
         self.stats = {
             "total_requests": 0,
@@ -215,7 +385,64 @@ class ModelRouter:
             "failed_requests": 0,
             "total_cost": 0.0,
             "total_tokens": 0,
-            "average_response_time": 0.0,
+            "cache_hits": 0,
+            # 只累加总耗时，平均值在 get_statistics 中计算
+            "sum_response_time": 0.0,
+        }
+
+    @property
+    def model_configs(self) -> Mapping[TaskType, ModelConfig]:
+        """任务类型 -> 模型配置（只读；修改时整体赋值，以便重建索引）"""
+        return self._model_configs
+
+    @model_configs.setter
+    def model_configs(self, configs: Mapping[TaskType, ModelConfig]) -> None:
+        self._model_configs = MappingProxyType(dict(configs))
+        # 模型名称 -> 配置的索引；同名模型以第一个配置为准
+        self._name_index: Dict[str, ModelConfig] = {}
+        for config in configs.values():
+            self._name_index.setdefault(config.name, config)
+        # 每个任务类型预先解析出模型（未配置的任务使用通用模型；均未配置的任务不收录）
+        general = configs.get(TaskType.GENERAL)
+        self._task_models: Dict[TaskType, ModelConfig] = {
+            task_type: configs.get(task_type, general)
+            for task_type in TaskType
+            if task_type in configs or general is not None
+        }
+        self._resolve_fallback_chain()
+
+    @property
+    def fallback_models(self) -> Dict[TaskType, List[str]]:
+        """任务类型 -> 备用模型名列表"""
+        return self._fallback_models
+
+    @fallback_models.setter
+    def fallback_models(self, fallbacks: Dict[TaskType, List[str]]) -> None:
+        self._fallback_models = fallbacks
+        self._resolve_fallback_chain()
+
+    def _resolve_fallback_chain(self) -> None:
+        """预先将各任务的备用模型名解析为配置，并提示未配置的模型名"""
+        fallbacks = getattr(self, "_fallback_models", None)
+        if fallbacks is None or not hasattr(self, "_name_index"):
+            return
+
+        # 默认备用表中未配置的模型（如 gpt-4o-mini）一向按本地模型调用，只提示用户自行配置的模型名
+        missing = sorted(
+            {
+                name
+                for task_type, names in fallbacks.items()
+                for name in names
+                if name not in self._name_index
+                and name not in FALLBACK_MODELS.get(task_type, ())
+            }
+        )
+        if missing:
+            print(f"[WARNING] 备用模型未配置，将按本地模型调用: {', '.join(missing)}")
+
+        self._fallback_chain: Dict[TaskType, List[ModelConfig]] = {
+            task_type: [self._get_model_config_by_name(name) for name in names]
+            for task_type, names in fallbacks.items()
         }
 
     def get_model_for_task(self, task_type: TaskType, **kwargs) -> ModelConfig:
@@ -239,13 +466,18 @@ class ModelRouter:
             if preferred:
                 return preferred
 
-        return self.model_configs.get(task_type, self.model_configs[TaskType.GENERAL])
+        config = self._task_models.get(task_type)
+        if config is None:
+            raise KeyError(
+                f"任务类型 {task_type.value} 未配置模型，且未配置 TaskType.GENERAL 通用模型"
+            )
+        return config
 
     def _get_model_config_by_name(self, model_name: str) -> ModelConfig:
         """根据模型名称获取配置"""
-        for config in self.model_configs.values():
-            if config.name == model_name:
-                return config
+        config = self._name_index.get(model_name)
+        if config is not None:
+            return config
         return ModelConfig(name=model_name, provider=Provider.LOCAL)
 
     def _get_preferred_model(self, task_type: TaskType) -> Optional[ModelConfig]:
@@ -319,37 +551,46 @@ class ModelRouter:
                 "max_tokens": max_tokens,
             }
 
+        # 命中缓存时跳过HTTP请求（调用时传入 use_cache=False 可强制重新生成）
+        cache_key = None
+        if self._cache_conn is not None and kwargs.get("use_cache", True):
+            cache_key = blake2b(
+                json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")
+            ).digest()
+            cached = self._get_cached_response(cache_key, model_config, start_time)
+            if cached is not None:
+                return cached
+
+        # 流式返回：边接收边拼接，无需等待并缓冲完整响应体
+        stream = model_config.provider in STREAMING_PROVIDERS
+        if stream:
+            payload["stream"] = True
+            payload["stream_options"] = {"include_usage": True}
+
         headers = {"Content-Type": "application/json"}
         if self.api_key:
             headers["Authorization"] = f"Bearer {self.api_key}"
 
-        # 发送请求
+        # 发送请求（失败重试由会话的连接适配器处理）
         response = None
         error = None
 
-        for attempt in range(self.max_retries):
-            try:
-                resp = requests.post(
-                    url,
-                    json=payload,
-                    headers=headers,
-                    timeout=self.default_timeout,
-                )
-                resp.raise_for_status()
-                response = resp.json()
-                break
-            except requests.exceptions.RequestException as e:
-                error = e
-                if attempt < self.max_retries - 1:
-                    time.sleep(1)  # 重试前等待
-                continue
+        try:
+            with self._provider_semaphores[model_config.provider]:
+                with self._post(url, _json_dumps(payload), headers, stream) as resp:
+                    response = (
+                        self._read_stream(resp) if stream else _json_loads(resp.content)
+                    )
+        except self._http_errors + (ValueError,) as e:
+            error = e
 
         # 处理响应
         end_time = time.time()
         response_time = end_time - start_time
 
         if response is None:
-            self.stats["failed_requests"] += 1
+            with self._stats_lock:
+                self.stats["failed_requests"] += 1
             raise Exception(f"模型调用失败: {error}")
 
         # 解析响应
@@ -357,18 +598,20 @@ class ModelRouter:
             response, model_config, messages
         )
 
+        if cache_key is not None:
+            with self._cache_lock, self._cache_conn:
+                self._cache_conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?, ?)",
+                    (cache_key, content, input_tokens, output_tokens),
+                )
+
         # 更新统计
-        self.stats["total_requests"] += 1
-        self.stats["successful_requests"] += 1
-        self.stats["total_cost"] += cost
-        self.stats["total_tokens"] += input_tokens + output_tokens
-
-        # 更新平均响应时间
-        total = self.stats["successful_requests"]
-        current_avg = self.stats["average_response_time"]
-        self.stats["average_response_time"] = (
-            current_avg * (total - 1) + response_time
-        ) / total
+        with self._stats_lock:
+            self.stats["total_requests"] += 1
+            self.stats["successful_requests"] += 1
+            self.stats["total_cost"] += cost
+            self.stats["total_tokens"] += input_tokens + output_tokens
+            self.stats["sum_response_time"] += response_time
 
         return ModelResponse(
             content=content,
@@ -380,6 +623,139 @@ class ModelRouter:
             cost=cost,
         )
 
+    @contextmanager
+    def _post(
+        self, url: str, body: bytes, headers: Dict[str, str], stream: bool
+    ) -> Iterator[Any]:
+        """
+        发送POST请求并返回已检查状态码的响应
+
+        requests 会话的重试由连接适配器完成；httpx 客户端的传输层只重试连接
+        失败，可重试的状态码在此按相同的退避策略重试
+        """
+        if self._http2_client is None:
+            with self.session.post(
+                url,
+                data=body,
+                headers=headers,
+                timeout=self.default_timeout,
+                stream=stream,
+            ) as resp:
+                resp.raise_for_status()
+                yield resp
+            return
+
+        attempts = max(self.max_retries, 1)
+        for attempt in range(attempts):
+            with self._http2_client.stream(
+                "POST", url, content=body, headers=headers
+            ) as resp:
+                if resp.status_code in RETRY_STATUS_CODES and attempt < attempts - 1:
+                    time.sleep(
+                        self._retry_delay(resp.headers.get("Retry-After"), attempt)
+                    )
+                    continue
+                resp.raise_for_status()
+                if not stream:
+                    resp.read()
+                yield resp
+                return
+
+    @staticmethod
+    def _retry_delay(retry_after: Optional[str], attempt: int) -> float:
+        """
+        计算重试前的等待秒数：指数退避加随机抖动，且不短于服务端要求的 Retry-After
+
+        Args:
+            retry_after: Retry-After 响应头（秒数或HTTP日期）
+            attempt: 已失败的次数（从0开始）
+        """
+        delay = RETRY_BACKOFF * 2**attempt + random.uniform(0, RETRY_JITTER)
+        if not retry_after:
+            return delay
+        try:
+            requested = float(retry_after)
+        except ValueError:
+            try:
+                requested = parsedate_to_datetime(retry_after).timestamp() - time.time()
+            except (TypeError, ValueError):
+                requested = 0.0
+        return max(delay, requested)
+
+    def _get_cached_response(
+        self, cache_key: bytes, model_config: ModelConfig, start_time: float
+    ) -> Optional[ModelResponse]:
+        """读取缓存的响应；缓存命中不产生费用"""
+        with self._cache_lock:
+            row = self._cache_conn.execute(
+                "SELECT content, input_tokens, output_tokens FROM llm_cache WHERE key = ?",
+                (cache_key,),
+            ).fetchone()
+        if row is None:
+            return None
+
+        with self._stats_lock:
+            self.stats["cache_hits"] += 1
+
+        content, input_tokens, output_tokens = row
+        return ModelResponse(
+            content=content,
+            model=model_config.name,
+            provider=model_config.provider,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            response_time=time.time() - start_time,
+            cost=0.0,
+        )
+
+    def _read_stream(self, resp: Any) -> Dict:
+        """
+        读取SSE流式响应并合并为完整响应
+
+        服务端或代理忽略 stream 参数、直接返回JSON时按普通响应解析
+
+        Returns:
+            OpenAI格式的响应；流中没有用量信息时返回 {"content": ...}，
+            由 _parse_response 估算token数
+
+        Raises:
+            ValueError: 事件流中没有任何数据事件
+        """
+        content_type = resp.headers.get("Content-Type", "")
+        if "text/event-stream" not in content_type:
+            body = resp.content if isinstance(resp, requests.Response) else resp.read()
+            return _json_loads(body)
+
+        pieces = []
+        usage = None
+        received = False
+
+        lines = (
+            resp.iter_lines(decode_unicode=True)
+            if isinstance(resp, requests.Response)
+            else resp.iter_lines()
+        )
+        for line in lines:
+            if not line or not line.startswith("data: "):
+                continue
+            data = line[6:]
+            if data == "[DONE]":
+                break
+            received = True
+            chunk = _json_loads(data)
+            for choice in chunk.get("choices") or ():
+                pieces.append((choice.get("delta") or {}).get("content") or "")
+            if chunk.get("usage"):
+                usage = chunk["usage"]
+
+        if not received:
+            raise ValueError("流式响应中没有数据事件")
+
+        content = "".join(pieces)
+        if usage is None:
+            return {"content": content}
+        return {"choices": [{"message": {"content": content}}], "usage": usage}
+
     def _parse_response(
         self, response: Dict, model_config: ModelConfig, messages: List[Dict[str, str]]
     ) -> Tuple[str, int, int, float]:
@@ -404,21 +780,23 @@ class ModelRouter:
             output_tokens = usage.get("completion_tokens", 0)
 
             # 计算成本
-            cost = (
-                input_tokens / 1000 * model_config.cost_per_1k_input
-                + output_tokens / 1000 * model_config.cost_per_1k_output
-            )
+            cost = model_config.cost(input_tokens, output_tokens)
 
             return content, input_tokens, output_tokens, cost
 
-        # 其他格式（简化处理）
+        # 其他格式（简化处理，token数按模型编码计算，编码不可用时估算）
         content = response.get("content", str(response))
-        input_tokens = len(str(messages)) // 4  # 估算
-        output_tokens = len(content) // 4  # 估算
-        cost = (
-            input_tokens / 1000 * model_config.cost_per_1k_input
-            + output_tokens / 1000 * model_config.cost_per_1k_output
-        )
+        encoding = _get_token_encoding(model_config.name)
+        if encoding is None:
+            input_tokens = len(str(messages)) // 4  # 估算
+            output_tokens = len(content) // 4  # 估算
+        else:
+            input_tokens = sum(
+                len(encoding.encode(message["content"], disallowed_special=()))
+                for message in messages
+            )
+            output_tokens = len(encoding.encode(content, disallowed_special=()))
+        cost = model_config.cost(input_tokens, output_tokens)
 
         return content, input_tokens, output_tokens, cost
 
@@ -446,14 +824,38 @@ class ModelRouter:
         # 获取最佳模型
         model_config = self.get_model_for_task(task_type, **kwargs)
 
-        # 构建消息
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": prompt})
-
         # 调用模型
-        return self.call_model(model_config, messages, temperature, **kwargs)
+        return self.call_model(
+            model_config,
+            self._build_messages(system_prompt, prompt),
+            temperature,
+            **kwargs,
+        )
+
+    def process_tasks_batch(
+        self, tasks: List[Tuple[TaskType, str, Optional[str]]]
+    ) -> List[ModelResponse]:
+        """
+        并发处理多个相互独立的任务
+
+        Args:
+            tasks: (任务类型, 用户提示, 系统提示) 列表
+
+        Returns:
+            与 tasks 顺序一致的模型响应列表；任一任务失败时抛出其异常
+        """
+        if not tasks:
+            return []
+
+        workers = min(len(tasks), MAX_BATCH_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    self.process_with_fallback, task_type, prompt, system_prompt
+                )
+                for task_type, prompt, system_prompt in tasks
+            ]
+            return [future.result() for future in futures]
 
     def process_with_fallback(
         self,
@@ -489,19 +891,14 @@ class ModelRouter:
             print(f"[INFO] Trying fallback models...")
 
             # 尝试备用模型
-            fallbacks = self.fallback_models.get(task_type, [])
+            messages = self._build_messages(system_prompt, prompt)
 
-            for fallback_model in fallbacks:
+            for fallback_config in self._fallback_chain.get(task_type, ()):
                 try:
-                    fallback_config = self._get_model_config_by_name(fallback_model)
-                    return self.call_model(
-                        fallback_config,
-                        self._build_messages(system_prompt, prompt),
-                        **kwargs,
-                    )
+                    return self.call_model(fallback_config, messages, **kwargs)
                 except Exception as fallback_error:
                     print(
-                        f"[WARNING] Fallback model {fallback_model} failed: {fallback_error}"
+                        f"[WARNING] Fallback model {fallback_config.name} failed: {fallback_error}"
                     )
                     continue
 
@@ -511,16 +908,22 @@ class ModelRouter:
         self, system_prompt: Optional[str], user_prompt: str
     ) -> List[Dict[str, str]]:
         """构建消息列表"""
-        messages = []
         if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": user_prompt})
-        return messages
+            return [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ]
+        return [{"role": "user", "content": user_prompt}]
 
     def get_statistics(self) -> Dict[str, Any]:
         """获取使用统计"""
         return {
             **self.stats,
+            "average_response_time": (
+                self.stats["sum_response_time"] / self.stats["successful_requests"]
+                if self.stats["successful_requests"] > 0
+                else 0.0
+            ),
             "average_cost_per_request": (
                 self.stats["total_cost"] / self.stats["total_requests"]
                 if self.stats["total_requests"] > 0
@@ -545,11 +948,7 @@ class ModelRouter:
             估计成本
         """
         model_config = self.get_model_for_task(task_type)
-        return (
-            estimated_tokens
-            / 1000
-            * (model_config.cost_per_1k_input + model_config.cost_per_1k_output)
-        )
+        return model_config.cost(estimated_tokens, estimated_tokens)
 
 
 # 便捷函数
@@ -82,6 +82,16 @@ class TestLiteratureDB:
         assert paper.year == 2024
         assert paper.doi == "10.1000/test"
 
+        # 含冠词的复姓：逗号前整体作为姓氏
+        paper = Paper(
+            id=2,
+            title="Test Paper",
+            authors="Van der Berg, J; Smith, A",
+            journal="Test Journal",
+            year=2020,
+        )
+        assert paper.generate_citekey() == "Vanderberg2020"
+
     def test_citation_formatting(self, tmp_path):
         """测试引用格式化"""
         from src.literature import LiteratureDatabaseManager, Paper
@@ -105,6 +115,95 @@ class TestLiteratureDB:
         citation = manager.format_citation(paper, "numbered")
         assert "[1]" in citation
 
+    def test_search_full_text(self, tmp_path):
+        """测试全文检索"""
+        from src.literature import LiteratureDatabaseManager
+
+        txt_path = tmp_path / "wos.txt"
+        txt_path.write_text(
+            "FN Clarivate Analytics Web of Science\n"
+            "VR 1.0\n"
+            "PT J\n"
+            "AU Wang, J\n"
+            "   Liu, Q\n"
+            "TI Heavy rainfall stimulates N2O emissions\n"
+            "SO AGRICULTURE ECOSYSTEMS & ENVIRONMENT\n"
+            "AB Extreme precipitation events increase nitrous oxide fluxes.\n"
+            "PY 2024\n"
+            "TC 5\n"
+            "UT WOS:001292047900001\n"
+            "ER\n"
+            "\n"
+            "EF",
+            encoding="utf-8",
+        )
+
+        manager = LiteratureDatabaseManager(str(tmp_path / "test_search.db"))
+        assert manager.import_from_wos_txt(str(txt_path)) == 1
+
+        papers = manager.search("nitro")
+        assert [p.title for p in papers] == ["Heavy rainfall stimulates N2O emissions"]
+        assert papers[0].authors == "Wang, J; Liu, Q"
+        assert papers[0].cited_by == 5
+        assert manager.search("drought") == []
+        # 关键词检索不匹配作者列；无可索引词的检索词不退化为返回全部
+        assert manager.search("Wang") == []
+        assert manager.search("!!!") == []
+        assert len(manager.search("")) == 1
+
+        # 作者姓氏索引：重复导入不产生重复行
+        assert manager.import_from_wos_txt(str(txt_path)) == 1
+        assert len(manager.get_papers_by_author("liu", 2024)) == 1
+        assert manager.get_papers_by_author("Liu", 2023) == []
+        found, paper, _ = manager.validate_citation("Wang et al., 2024")
+        assert found and paper.cited_by == 5
+        manager.close()
+
+    def test_keyword_tokens(self):
+        """测试推荐引用的关键词切分"""
+        from src.literature.db_manager import _keyword_tokens
+
+        # 含数字、下划线或非ASCII字母的词整体不计入
+        assert _keyword_tokens("PM2.5 and CO2 fluxes under_way in Wheat-fields") == [
+            "fluxes",
+            "wheat",
+            "fields",
+        ]
+        assert _keyword_tokens("naïve soils, 研究nitrogen, Nitrogen-fixing") == [
+            "soils",
+            "nitrogen",
+            "fixing",
+        ]
+
+    def test_read_only_legacy_db(self, tmp_path):
+        """测试只读打开未迁移的旧版数据库"""
+        import sqlite3
+        from src.literature import LiteratureDatabaseManager
+
+        # 旧版建库只有 papers 表，没有全文索引与作者姓氏表
+        db_path = tmp_path / "legacy.db"
+        conn = sqlite3.connect(str(db_path))
+        conn.execute(
+            "CREATE TABLE papers (id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " wos_id TEXT UNIQUE, title TEXT NOT NULL, authors TEXT, journal TEXT,"
+            " year INTEGER, volume TEXT, issue TEXT, pages TEXT, doi TEXT UNIQUE,"
+            " abstract TEXT, keywords TEXT, cited_by INTEGER, research_area TEXT,"
+            " created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+        )
+        conn.execute(
+            "INSERT INTO papers (wos_id, title, authors, year, cited_by)"
+            " VALUES ('WOS:1', 'Heavy rainfall', 'Wang, J; Liu, Q', 2024, 5)"
+        )
+        conn.commit()
+        conn.close()
+
+        manager = LiteratureDatabaseManager(str(db_path), read_only=True)
+        found, paper, _ = manager.validate_citation("Liu et al., 2024")
+        assert found and paper.title == "Heavy rainfall"
+        assert manager.get_papers_by_author("Zhang", 2024) == []
+        assert [p.title for p in manager.search("rainfall")] == ["Heavy rainfall"]
+        manager.close()
+
 
 class TestCoordinator:
     """协调器测试"""
@@ -161,6 +260,21 @@ class TestIntegrator:
         integrator = DraftIntegrator("config/config.yaml")
         assert integrator is not None
 
+    def test_config_cache(self, tmp_path):
+        """测试配置缓存在文件变化后失效"""
+        from src.integrator import DraftIntegrator
+
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("quality:\n  thresholds:\n    min: 1\n")
+
+        first = DraftIntegrator(str(config_file))
+        second = DraftIntegrator(str(config_file))
+        assert first.config is second.config
+
+        config_file.write_text("quality:\n  thresholds:\n    min: 22\n")
+        third = DraftIntegrator(str(config_file))
+        assert third.quality_thresholds == {"min": 22}
+
     def test_transition_words(self):
         """测试过渡词"""
         from src.integrator import DraftIntegrator
@@ -191,6 +305,25 @@ class TestIntegrator:
         assert "introduction" in sections
         assert "Test content" in sections["introduction"]
 
+    def test_integrate_sections_in_memory(self, tmp_path):
+        """测试整合时直接使用内存中的章节内容"""
+        from src.integrator import integrate_sections
+
+        intro_file = tmp_path / "introduction.md"
+        intro_file.write_text("## Introduction\n\nOn-disk introduction.")
+        methods_file = tmp_path / "methods.md"
+        methods_file.write_text("## Methods\n\nStale methods on disk.")
+
+        draft, _ = integrate_sections(
+            {"introduction": str(intro_file), "methods": str(methods_file)},
+            str(tmp_path / "draft.md"),
+            section_contents={"methods": "## Methods\n\nIn-memory methods."},
+        )
+
+        assert "On-disk introduction." in draft
+        assert "In-memory methods." in draft
+        assert "Stale methods" not in draft
+
     def test_completeness_validation(self):
         """测试完整性验证"""
         from src.integrator import DraftIntegrator
@@ -229,6 +362,26 @@ class TestIntegrator:
         assert len(sample_issues) >= 1
 
 
+class TestDocumentParser:
+    """文档解析器测试"""
+
+    def test_parse_cache_invalidation(self, tmp_path):
+        """测试解析结果缓存在文件变化后失效"""
+        from src.document_processor import SimpleDocumentParser
+
+        doc_file = tmp_path / "doc.md"
+        doc_file.write_text("# Title\n\nFirst paragraph.")
+
+        parser = SimpleDocumentParser()
+        first = parser.parse(str(doc_file))
+        assert parser.extract_full_text(str(doc_file)).endswith("First paragraph.")
+        assert parser._parse_cached.cache_info().hits == 1
+
+        doc_file.write_text("# Title\n\nFirst paragraph.\n\nSecond paragraph.")
+        second = parser.parse(str(doc_file))
+        assert len(second) == len(first) + 1
+
+
 class TestCLI:
     """CLI测试"""
 